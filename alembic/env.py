@@ -12,6 +12,7 @@ from alembic import context
 from app.models.users import Users
 from app.models.videos import Video
 from app.models.video_snapshots import VideoSnapshot
+from app.models.load_checkpoints import LoadCheckpoint
 
 config = context.config
 
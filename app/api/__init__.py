@@ -1,9 +1,10 @@
 from fastapi import APIRouter
-from app.api import auth, query
+from app.api import auth, ingest, query
 
 api_router = APIRouter()
 
 api_router.include_router(auth.auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(query.query_router, prefix="/query", tags=["query"])
+api_router.include_router(ingest.ingest_router, prefix="/ingest", tags=["ingest"])
 
 __all__ = ["api_router"]
\ No newline at end of file
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
 from app.schemas.user import UserCreate, UserResponse
-from app.services.telegram_service import TelegramService
+from app.services.telegram_service import TelegramService, get_telegram_user_cache
 from app.utils.security import verify_bot_token
 
 auth_router = APIRouter()
@@ -17,7 +17,7 @@ async def create_telegram_user(
     db: AsyncSession = Depends(get_db),
     bot_token: str = Depends(verify_bot_token),
 ):
-    telegram_service = TelegramService(db)
+    telegram_service = TelegramService(db, get_telegram_user_cache(request))
     
     try:
         user, is_new = await telegram_service.create_or_get_telegram_user(
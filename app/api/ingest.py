@@ -0,0 +1,63 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import IngestSettings, get_settings
+from app.db.database import get_async_sessionmaker
+from app.schemas.ingest import IngestFailure, IngestSummary
+from app.services.data_generation_service import bump_data_generation
+from app.services.ingest_service import IngestError, NDJSONIngestService
+from app.utils.security import verify_bot_token
+
+ingest_router = APIRouter()
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def stream_ingest_acks(request: Request) -> AsyncIterator[str]:
+    settings = get_settings(IngestSettings)
+    batches = videos = snapshots = 0
+
+    try:
+        async with get_async_sessionmaker()() as db:
+            ingest_service = NDJSONIngestService(
+                db,
+                batch_size=settings.ingest_batch_size,
+                queue_size=settings.ingest_queue_size,
+                max_line_bytes=settings.ingest_max_line_bytes,
+            )
+            async for ack in ingest_service.ingest(request.stream()):
+                batches += 1
+                videos += ack.videos
+                snapshots += ack.snapshots
+                yield ack.model_dump_json() + "\n"
+        result = IngestSummary(batches=batches, videos=videos, snapshots=snapshots)
+    except IngestError as e:
+        logger.warning(f"NDJSON ingestion rejected: {e}")
+        result = IngestFailure(line=e.line, error=e.detail)
+    except Exception as e:
+        logger.exception(f"Error ingesting NDJSON stream: {e}")
+        result = IngestFailure(error="Failed to ingest data")
+    finally:
+        if batches:
+            await bump_data_generation(request.app.state.arq_pool)
+
+    yield result.model_dump_json() + "\n"
+
+
+@ingest_router.post("/ndjson", response_class=NDJSONStreamingResponse)
+async def ingest_ndjson(
+    request: Request,
+    bot_token: str = Depends(verify_bot_token),
+):
+    return NDJSONStreamingResponse(stream_ingest_acks(request))
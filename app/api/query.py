@@ -1,39 +1,30 @@
-from fastapi import APIRouter, HTTPException, status
-from loguru import logger
-from arq import create_pool
-from arq.connections import RedisSettings as ArqRedisSettings
+from typing import Optional
+from uuid import uuid4
 
-from app.core.config import RedisSettings
-from app.schemas.query import QueryRequest, QueryResponse
-from app.tasks.query_task import process_query_task
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from loguru import logger
+from arq.connections import ArqRedis
+from arq.utils import timestamp_ms
 
-query_router = APIRouter()
+from app.db.redis import get_arq_pool
+from app.schemas.query import QueryJobResponse, QueryJobStatus, QueryRequest, QueryResponse
+from app.services.query_executor import QueryExecutor, get_query_executor
+from app.services.query_job_service import QueryJobNotFound, QueryJobService
+from app.services.rate_limit_service import admit_query
+from app.utils.security import verify_bot_token
 
+MAX_JOB_WAIT_SECONDS = 60
 
-async def get_arq_pool():
-    redis_config = RedisSettings()
-    redis_settings = ArqRedisSettings(
-        host=redis_config.redis_host,
-        port=redis_config.redis_port
-    )
-    pool = await create_pool(redis_settings)
-    return pool
+query_router = APIRouter()
 
 
-@query_router.post("/query", response_model=QueryResponse)
+@query_router.post("/query", response_model=QueryResponse, dependencies=[Depends(admit_query)])
 async def process_query(
     payload: QueryRequest,
+    executor: QueryExecutor = Depends(get_query_executor),
 ):
-    pool = None
     try:
-        pool = await get_arq_pool()
-        
-        job = await pool.enqueue_job(
-            "process_query_task",
-            payload.query
-        )
-        
-        result = await job.result(timeout=60)
+        result = await executor.run(payload.query)
         
         return QueryResponse(result=result)
         
@@ -49,7 +40,70 @@ async def process_query(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process query"
         )
-    finally:
-        if pool:
-            await pool.close()
 
+
+@query_router.post(
+    "/jobs",
+    response_model=QueryJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admit_query)],
+)
+async def submit_query_job(
+    payload: QueryRequest,
+    pool: ArqRedis = Depends(get_arq_pool),
+    executor: QueryExecutor = Depends(get_query_executor),
+    x_bot_token: Optional[str] = Header(None, alias="X-Bot-Token"),
+):
+    if payload.reply_chat_id is not None:
+        await verify_bot_token(x_bot_token)
+    
+    job_service = QueryJobService(pool, executor.plan_cache)
+    
+    if executor.has_inline_capacity():
+        job_id = uuid4().hex
+        started_ms = timestamp_ms()
+        try:
+            result = await executor.run_inline(payload.query)
+        except ValueError as e:
+            logger.warning(f"Query validation error: {e}")
+            await job_service.store_result(job_id, payload.query, e, success=False, started_ms=started_ms)
+            return QueryJobResponse(job_id=job_id, status=QueryJobStatus.FAILED, error=str(e))
+        except Exception as e:
+            logger.exception(f"Error processing query inline: {e}")
+            await job_service.store_result(job_id, payload.query, e, success=False, started_ms=started_ms)
+            return QueryJobResponse(job_id=job_id, status=QueryJobStatus.FAILED, error="Failed to process query")
+        
+        await job_service.store_result(job_id, payload.query, result, success=True, started_ms=started_ms)
+        return QueryJobResponse(job_id=job_id, status=QueryJobStatus.COMPLETE, result=result)
+
+    try:
+        return await job_service.submit(payload.query, reply_chat_id=payload.reply_chat_id)
+    except Exception as e:
+        logger.exception(f"Error submitting query job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to submit query"
+        )
+
+
+@query_router.get("/jobs/{job_id}", response_model=QueryJobResponse)
+async def get_query_job(
+    job_id: str,
+    wait: float = Query(default=0, ge=0, le=MAX_JOB_WAIT_SECONDS),
+    pool: ArqRedis = Depends(get_arq_pool),
+):
+    job_service = QueryJobService(pool)
+    
+    try:
+        return await job_service.get(job_id, wait=wait)
+    except QueryJobNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Query job not found"
+        )
+    except Exception as e:
+        logger.exception(f"Error fetching query job {job_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch query job"
+        )
@@ -1,16 +1,46 @@
-from arq.connections import RedisSettings as ArqRedisSettings
+from typing import Any, Dict
 
-from app.core.config import RedisSettings
-from app.tasks.query_task import process_query_task
+from loguru import logger
+from prometheus_client import start_http_server
 
-app_redis_config = RedisSettings()
+from app.core.config import MetricsSettings, QuerySettings, get_settings
+from app.db.redis import get_arq_redis_settings
+from app.services.plan_cache_service import PlanCache
+from app.services.query_job_service import EXECUTE_QUEUE_NAME, JOB_RESULT_TTL_SECONDS, PARSE_QUEUE_NAME
+from app.tasks.query_task import execute_query_task, parse_query_task
+from app.utils.tracing import setup_tracing, shutdown_tracing
+
+
+async def startup(ctx: Dict[str, Any]) -> None:
+    port = get_settings(MetricsSettings).worker_metrics_port
+    start_http_server(port)
+    logger.info(f"Worker metrics exposed on port {port}")
+    setup_tracing("worker")
+    
+    ctx["plan_cache"] = PlanCache(ctx["redis"], get_settings(QuerySettings).query_plan_cache_ttl)
+
+
+async def shutdown(ctx: Dict[str, Any]) -> None:
+    shutdown_tracing()
 
 
 class WorkerSettings:
-    functions = [process_query_task]
+    functions = [parse_query_task]
+    on_startup = startup
+    on_shutdown = shutdown
+    queue_name = PARSE_QUEUE_NAME
+    max_jobs = get_settings(QuerySettings).query_parse_worker_max_jobs
+    keep_result = JOB_RESULT_TTL_SECONDS
     
-    redis_settings = ArqRedisSettings(
-        host=app_redis_config.redis_host,
-        port=app_redis_config.redis_port
-    )
+    redis_settings = get_arq_redis_settings()
+
 
+class ExecuteWorkerSettings:
+    functions = [execute_query_task]
+    on_startup = startup
+    on_shutdown = shutdown
+    queue_name = EXECUTE_QUEUE_NAME
+    max_jobs = get_settings(QuerySettings).query_execute_worker_max_jobs
+    keep_result = JOB_RESULT_TTL_SECONDS
+    
+    redis_settings = get_arq_redis_settings()
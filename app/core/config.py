@@ -1,4 +1,5 @@
-from typing import Optional, ClassVar
+from functools import lru_cache
+from typing import Optional, ClassVar, Type, TypeVar
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings
 from enum import Enum
@@ -71,6 +72,7 @@ class RedisSettings(BaseSettings):
     redis_user_password: Optional[str] = Field(default=None, alias="REDIS_USER_PASSWORD")
     redis_ttl: int = Field(alias="REDIS_TTL")
     redis_host: str = Field(...,alias="REDIS_HOST")
+    redis_max_connections: Optional[int] = Field(default=None, ge=1, alias="REDIS_MAX_CONNECTIONS")
     model_config = BaseConfig.model_config
 
 class JWTSettings(BaseSettings):
@@ -84,6 +86,8 @@ class JWTSettings(BaseSettings):
 
 class TelegramSettings(BaseSettings):
     bot_token: str = Field(..., alias="TELEGRAM_BOT_TOKEN")
+    telegram_user_cache_ttl: float = Field(default=60.0, ge=0, alias="TELEGRAM_USER_CACHE_TTL")
+    telegram_user_cache_size: int = Field(default=10000, ge=1, alias="TELEGRAM_USER_CACHE_SIZE")
 
     model_config = BaseConfig.model_config
 
@@ -96,3 +100,67 @@ class GigaChatSettings(BaseSettings):
     giga_api_url: HttpUrl = Field(..., alias="GIGA_API_URL")
     
     model_config = BaseConfig.model_config
+
+
+class IngestSettings(BaseSettings):
+    ingest_batch_size: int = Field(default=500, ge=1, alias="INGEST_BATCH_SIZE")
+    ingest_queue_size: int = Field(default=4, ge=1, alias="INGEST_QUEUE_SIZE")
+    ingest_max_line_bytes: int = Field(default=10 * 1024 * 1024, ge=1, alias="INGEST_MAX_LINE_BYTES")
+
+    model_config = BaseConfig.model_config
+
+
+class QueryExecutionMode(str, Enum):
+    QUEUE = "queue"
+    INLINE = "inline"
+
+
+class QuerySettings(BaseSettings):
+    query_execution_mode: QueryExecutionMode = Field(default=QueryExecutionMode.QUEUE, alias="QUERY_EXECUTION_MODE")
+    query_inline_concurrency: int = Field(default=4, ge=1, alias="QUERY_INLINE_CONCURRENCY")
+    query_result_timeout: float = Field(default=60.0, gt=0, alias="QUERY_RESULT_TIMEOUT")
+    query_plan_cache_ttl: int = Field(default=3600, ge=0, alias="QUERY_PLAN_CACHE_TTL")
+    query_parse_worker_max_jobs: int = Field(default=10, ge=1, alias="QUERY_PARSE_WORKER_MAX_JOBS")
+    query_execute_worker_max_jobs: int = Field(default=20, ge=1, alias="QUERY_EXECUTE_WORKER_MAX_JOBS")
+
+    model_config = BaseConfig.model_config
+
+
+class RateLimitSettings(BaseSettings):
+    rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+    rate_limit_chat_capacity: int = Field(default=5, ge=1, alias="RATE_LIMIT_CHAT_CAPACITY")
+    rate_limit_chat_refill_per_second: float = Field(default=0.2, gt=0, alias="RATE_LIMIT_CHAT_REFILL_PER_SECOND")
+    rate_limit_global_capacity: int = Field(default=50, ge=1, alias="RATE_LIMIT_GLOBAL_CAPACITY")
+    rate_limit_global_refill_per_second: float = Field(default=5.0, gt=0, alias="RATE_LIMIT_GLOBAL_REFILL_PER_SECOND")
+    query_max_queue_depth: int = Field(default=100, ge=0, alias="QUERY_MAX_QUEUE_DEPTH")
+
+    model_config = BaseConfig.model_config
+
+
+class MetricsSettings(BaseSettings):
+    worker_metrics_port: int = Field(default=9191, ge=1, le=65535, alias="WORKER_METRICS_PORT")
+
+    model_config = BaseConfig.model_config
+
+
+class TracingExporter(str, Enum):
+    NONE = "none"
+    OTLP = "otlp"
+    FILE = "file"
+
+
+class TracingSettings(BaseSettings):
+    tracing_exporter: TracingExporter = Field(default=TracingExporter.NONE, alias="TRACING_EXPORTER")
+    tracing_otlp_endpoint: str = Field(default="http://localhost:4318/v1/traces", alias="TRACING_OTLP_ENDPOINT")
+    tracing_file: str = Field(default="logs/traces.jsonl", alias="TRACING_FILE")
+    tracing_sample_ratio: float = Field(default=1.0, ge=0, le=1, alias="TRACING_SAMPLE_RATIO")
+
+    model_config = BaseConfig.model_config
+
+
+SettingsT = TypeVar("SettingsT", bound=BaseSettings)
+
+
+@lru_cache(maxsize=None)
+def get_settings(settings_class: Type[SettingsT]) -> SettingsT:
+    return settings_class()
@@ -3,7 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool 
 
-from app.core.config import DatabaseSettings
+from app.core.config import DatabaseSettings, get_settings
+from app.utils.metrics import instrument_engine
 
 Base = declarative_base()
 
@@ -16,12 +17,13 @@ _AsyncSessionLocal = None
 def get_engine():
     global _engine
     if _engine is None:
-        db_settings = DatabaseSettings()
+        db_settings = get_settings(DatabaseSettings)
         _engine = create_async_engine(
             db_settings.database_url,
             future=True,
             poolclass=NullPool,  
         )
+        instrument_engine(_engine)
     return _engine
 
 def get_async_sessionmaker():
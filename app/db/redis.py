@@ -0,0 +1,44 @@
+from typing import Dict
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings as ArqRedisSettings
+from fastapi import Request
+
+from app.core.config import RedisSettings, get_settings
+from app.utils.metrics import REDIS_POOL_CONNECTIONS
+
+
+def get_arq_redis_settings() -> ArqRedisSettings:
+    redis_config = get_settings(RedisSettings)
+    return ArqRedisSettings(
+        host=redis_config.redis_host,
+        port=redis_config.redis_port,
+        max_connections=redis_config.redis_max_connections,
+    )
+
+
+async def create_arq_pool() -> ArqRedis:
+    return await create_pool(get_arq_redis_settings())
+
+
+def get_arq_pool(request: Request) -> ArqRedis:
+    return request.app.state.arq_pool
+
+
+def get_pool_stats(pool: ArqRedis) -> Dict[str, int]:
+    connection_pool = pool.connection_pool
+    available = len(connection_pool._available_connections)
+    in_use = len(connection_pool._in_use_connections)
+    return {
+        "max_connections": connection_pool.max_connections,
+        "created_connections": available + in_use,
+        "available_connections": available,
+        "in_use_connections": in_use,
+    }
+
+
+def instrument_pool(pool: ArqRedis) -> None:
+    for state in ("created", "available", "in_use"):
+        REDIS_POOL_CONNECTIONS.labels(state=state).set_function(
+            lambda state=state: get_pool_stats(pool)[f"{state}_connections"]
+        )
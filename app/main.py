@@ -1,11 +1,26 @@
 import os
 import sys
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from arq.connections import ArqRedis
+from fastapi import Depends, FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import uvicorn
 from loguru import logger
 
-from app.core.config import AppSettings
+from app.core.config import (
+    AppSettings,
+    QuerySettings,
+    RateLimitSettings,
+    RedisSettings,
+    TelegramSettings,
+    get_settings,
+)
 from app.api import api_router
+from app.db.redis import create_arq_pool, get_arq_pool, get_pool_stats, instrument_pool
+from app.services.query_executor import QueryExecutor, get_query_executor
+from app.services.rate_limit_service import RateLimiter
+from app.services.telegram_service import TelegramUserCache
+from app.utils.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
 
 sys.path.append('/app')
 
@@ -21,7 +36,7 @@ def get_logger():
 
 def get_app_settings() -> AppSettings:
     try:
-        return AppSettings()
+        return get_settings(AppSettings)
     except Exception as e:
         logger.error(f"Error loading settings: {e}")
         logger.error(f"Using default settings")
@@ -35,14 +50,45 @@ def setup_logging():
         compression=settings.log_compression.value,
         format=settings.log_format,
     )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_tracing("api")
+    app.state.arq_pool = await create_arq_pool()
+    instrument_pool(app.state.arq_pool)
+    logger.info("ARQ Redis pool created")
+    app.state.query_executor = QueryExecutor.from_settings(app.state.arq_pool, get_settings(QuerySettings))
+    logger.info(f"Query execution mode: {app.state.query_executor.mode.value}")
+    telegram_settings = get_settings(TelegramSettings)
+    rate_limit_settings = get_settings(RateLimitSettings)
+    app.state.rate_limiter = (
+        RateLimiter(app.state.arq_pool, rate_limit_settings, telegram_settings.bot_token)
+        if rate_limit_settings.rate_limit_enabled
+        else None
+    )
+    app.state.telegram_user_cache = TelegramUserCache(
+        app.state.arq_pool,
+        ttl=get_settings(RedisSettings).redis_ttl,
+        local_ttl=telegram_settings.telegram_user_cache_ttl,
+        local_size=telegram_settings.telegram_user_cache_size,
+    )
+    try:
+        yield
+    finally:
+        await app.state.arq_pool.close()
+        logger.info("ARQ Redis pool closed")
+        shutdown_tracing()
+
 def create_app():
     settings = get_app_settings() 
     app = FastAPI(
         title=settings.app_name,
         description="API for Test application",
         version="1.0.0",  
+        lifespan=lifespan,
     )
     setup_logging()
+    app.add_middleware(TracingMiddleware)
     
     @app.get("/")
     def read_root():
@@ -50,6 +96,15 @@ def create_app():
     @app.get("/health")
     async def health_check():
         return {"status": "ok"}
+    @app.get("/health/redis")
+    async def redis_health_check(pool: ArqRedis = Depends(get_arq_pool)):
+        return {"status": "ok", "pool": get_pool_stats(pool)}
+    @app.get("/health/query")
+    async def query_health_check(executor: QueryExecutor = Depends(get_query_executor)):
+        return {"status": "ok", "executor": executor.stats()}
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
     app.include_router(api_router)
     
     return app
@@ -1,16 +1,20 @@
 import json
 import re
+import time
 from string import Template
 from typing import Dict, Any, Optional
 
-from gigachat import GigaChat
 from loguru import logger
 
-from app.core.config import GigaChatSettings
+from app.core.config import GigaChatSettings, get_settings
+from app.utils.metrics import LLM_REQUEST_SECONDS, PLAN_VALIDATION_SECONDS, record_error
+from app.utils.tracing import tracer
 
 
 class LLMService:
     def __init__(self, settings: GigaChatSettings):
+        from gigachat import GigaChat
+        
         self.settings = settings
         oauth_url_str = str(settings.giga_oauth_url)
         verify_ssl = "ngw.devices.sberbank.ru" not in oauth_url_str
@@ -215,13 +219,25 @@ $schema_description
         return parsed
     
     def parse_query(self, user_query: str) -> Dict[str, Any]:
+        with tracer.start_as_current_span("llm.parse_query", attributes={"llm.query_length": len(user_query)}):
+            return self._parse_query(user_query)
+    
+    def _parse_query(self, user_query: str) -> Dict[str, Any]:
         try:
             template = Template(self._prompt_template)
             prompt = template.safe_substitute(user_query=user_query)
             
             logger.debug(f"Sending query to LLM: {user_query[:100]}...")
             
-            response = self.client.chat(prompt)
+            started_at = time.perf_counter()
+            try:
+                response = self.client.chat(prompt)
+            except Exception:
+                LLM_REQUEST_SECONDS.labels(outcome="error").observe(time.perf_counter() - started_at)
+                raise
+            LLM_REQUEST_SECONDS.labels(outcome="ok").observe(time.perf_counter() - started_at)
+            
+            validation_started_at = time.perf_counter()
             content = response.choices[0].message.content.strip()
             
             logger.debug(f"LLM response: {content[:200]}...")
@@ -245,16 +261,19 @@ $schema_description
             parsed = self._fix_date_field(parsed)
             
             validated = self._validate_query_structure(parsed)
+            PLAN_VALIDATION_SECONDS.observe(time.perf_counter() - validation_started_at)
             
             logger.info(f"Successfully parsed query: {validated.get('query_type')} on {validated.get('table')}")
             
             return validated
             
         except json.JSONDecodeError as e:
+            record_error("llm", e)
             logger.error(f"Failed to parse JSON from LLM response: {e}")
             logger.error(f"Response content: {content}")
             raise ValueError(f"LLM вернул невалидный JSON: {e}")
         except Exception as e:
+            record_error("llm", e)
             logger.exception(f"Error in LLM service: {e}")
             raise
     
@@ -332,3 +351,12 @@ $schema_description
         
         return data
 
+
+_llm_service = None
+
+
+def get_llm_service() -> LLMService:
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService(get_settings(GigaChatSettings))
+    return _llm_service
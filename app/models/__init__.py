@@ -1,6 +1,7 @@
 from app.models.users import Users
 from app.models.videos import Video
 from app.models.video_snapshots import VideoSnapshot
+from app.models.load_checkpoints import LoadCheckpoint
 
-__all__ = ["Users", "Video", "VideoSnapshot"]
+__all__ = ["Users", "Video", "VideoSnapshot", "LoadCheckpoint"]
 
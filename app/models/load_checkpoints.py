@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Integer, String, func
+
+from app.db.database import Base
+
+
+class LoadCheckpoint(Base):
+    __tablename__ = "load_checkpoints"
+
+    file_key = Column(String, primary_key=True)
+    
+    file_path = Column(String, nullable=False)
+    batch_size = Column(Integer, nullable=False)
+    
+    batches_committed = Column(Integer, nullable=False, default=0)
+    videos_loaded = Column(Integer, nullable=False, default=0)
+    snapshots_loaded = Column(Integer, nullable=False, default=0)
+    
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class SnapshotIngest(BaseModel):
+    id: str = Field(..., min_length=1)
+    video_id: Optional[UUID] = None
+    views_count: int = 0
+    likes_count: int = 0
+    comments_count: int = 0
+    reports_count: int = 0
+    delta_views_count: int = 0
+    delta_likes_count: int = 0
+    delta_comments_count: int = 0
+    delta_reports_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+
+class VideoIngest(BaseModel):
+    id: UUID
+    creator_id: str = Field(..., min_length=1)
+    video_created_at: datetime
+    views_count: int = 0
+    likes_count: int = 0
+    comments_count: int = 0
+    reports_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+    snapshots: List[SnapshotIngest] = Field(default_factory=list)
+
+
+class IngestBatchAck(BaseModel):
+    type: Literal["batch"] = "batch"
+    batch: int
+    last_line: int
+    videos: int
+    snapshots: int
+
+
+class IngestSummary(BaseModel):
+    type: Literal["summary"] = "summary"
+    batches: int
+    videos: int
+    snapshots: int
+
+
+class IngestFailure(BaseModel):
+    type: Literal["error"] = "error"
+    line: Optional[int] = None
+    error: str
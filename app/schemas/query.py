@@ -1,10 +1,27 @@
+from enum import Enum
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class QueryRequest(BaseModel):
     query: str = Field(..., min_length=1)
+    reply_chat_id: Optional[int] = Field(default=None)
 
 
 class QueryResponse(BaseModel):
     result: int = Field(...)
 
+
+class QueryJobStatus(str, Enum):
+    QUEUED = "queued"
+    IN_PROGRESS = "in_progress"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
+class QueryJobResponse(BaseModel):
+    job_id: str = Field(...)
+    status: QueryJobStatus = Field(...)
+    result: Optional[int] = Field(default=None)
+    error: Optional[str] = Field(default=None)
@@ -0,0 +1,31 @@
+from loguru import logger
+from redis.asyncio import Redis
+
+DATA_GENERATION_KEY = "data:generation"
+
+
+async def get_data_generation(redis: Redis) -> int:
+    value = await redis.get(DATA_GENERATION_KEY)
+    return int(value) if value is not None else 0
+
+
+async def bump_data_generation(redis: Redis) -> int:
+    generation = await redis.incr(DATA_GENERATION_KEY)
+    logger.info(f"Data generation bumped to {generation}")
+    return generation
+
+
+async def notify_data_changed() -> None:
+    from app.db.redis import create_arq_pool
+
+    try:
+        pool = await create_arq_pool()
+    except Exception as e:
+        logger.warning(f"Could not bump data generation: {e}")
+        return
+
+    try:
+        await bump_data_generation(pool)
+    finally:
+        await pool.close()
+
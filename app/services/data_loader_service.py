@@ -1,131 +1,398 @@
+import hashlib
 import json
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID
 
+import ijson
 from dateutil import parser as date_parser
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.load_checkpoints import LoadCheckpoint
 from app.models.videos import Video
 from app.models.video_snapshots import VideoSnapshot
 
+videos_table = Video.__table__
+snapshots_table = VideoSnapshot.__table__
+
+VIDEO_COLUMNS = (
+    'id',
+    'creator_id',
+    'video_created_at',
+    'views_count',
+    'likes_count',
+    'comments_count',
+    'reports_count',
+    'created_at',
+    'updated_at',
+)
+
+SNAPSHOT_COLUMNS = (
+    'id',
+    'video_id',
+    'views_count',
+    'likes_count',
+    'comments_count',
+    'reports_count',
+    'delta_views_count',
+    'delta_likes_count',
+    'delta_comments_count',
+    'delta_reports_count',
+    'created_at',
+    'updated_at',
+)
+
+VIDEOS_STAGING_TABLE = 'videos_staging'
+SNAPSHOTS_STAGING_TABLE = 'video_snapshots_staging'
+
+CHECKPOINT_HEAD_BYTES = 1024 * 1024
+
+DATETIME_CACHE_SIZE = 65536
+
+CREATE_STAGING_SQL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {VIDEOS_STAGING_TABLE} "
+    f"(LIKE videos INCLUDING DEFAULTS) ON COMMIT DELETE ROWS",
+    f"CREATE TEMP TABLE IF NOT EXISTS {SNAPSHOTS_STAGING_TABLE} "
+    f"(LIKE video_snapshots INCLUDING DEFAULTS) ON COMMIT DELETE ROWS",
+)
+
+MERGE_VIDEOS_SQL = (
+    f"INSERT INTO videos ({', '.join(VIDEO_COLUMNS)}) "
+    f"SELECT {', '.join(VIDEO_COLUMNS)} FROM {VIDEOS_STAGING_TABLE} "
+    f"ON CONFLICT (id) DO NOTHING"
+)
+
+VIDEO_COUNTER_COLUMNS = (
+    'views_count',
+    'likes_count',
+    'comments_count',
+    'reports_count',
+)
+
+VIDEO_UPSERT_COLUMNS = VIDEO_COUNTER_COLUMNS + ('updated_at',)
+
+VIDEO_UPDATED_AT_INDEX = VIDEO_COLUMNS.index('updated_at')
+
+UPSERT_VIDEOS_SQL = (
+    f"INSERT INTO videos ({', '.join(VIDEO_COLUMNS)}) "
+    f"SELECT DISTINCT ON (id) {', '.join(VIDEO_COLUMNS)} FROM {VIDEOS_STAGING_TABLE} "
+    f"ORDER BY id, updated_at DESC "
+    f"ON CONFLICT (id) DO UPDATE SET "
+    f"{', '.join(f'{column} = EXCLUDED.{column}' for column in VIDEO_UPSERT_COLUMNS)} "
+    f"WHERE videos.updated_at <= EXCLUDED.updated_at "
+    f"AND ({', '.join(f'videos.{column}' for column in VIDEO_COUNTER_COLUMNS)}) IS DISTINCT FROM "
+    f"({', '.join(f'EXCLUDED.{column}' for column in VIDEO_COUNTER_COLUMNS)})"
+)
+
+MERGE_SNAPSHOTS_SQL = (
+    f"INSERT INTO video_snapshots ({', '.join(SNAPSHOT_COLUMNS)}) "
+    f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM {SNAPSHOTS_STAGING_TABLE} "
+    f"ON CONFLICT (id) DO NOTHING"
+)
+
+
+def checkpoint_key(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(CHECKPOINT_HEAD_BYTES))
+    return f"{file_path.name}:{file_path.stat().st_size}:{digest.hexdigest()[:16]}"
+
+
+def iter_videos(file_path: Path, stream: bool = False) -> Iterator[Dict[str, Any]]:
+    if not stream:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from data.get('videos', [])
+        return
+
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, 'videos.item', use_float=True)
+
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_datetime_string(value: str) -> datetime:
+    try:
+        if value.endswith('Z'):
+            return datetime.fromisoformat(value[:-1] + '+00:00')
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return date_parser.parse(value)
+
+
+def parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return _parse_datetime_string(value)
+    return date_parser.parse(value)
+
+
+def transform_video(video_data: Dict[str, Any]) -> Tuple[tuple, List[tuple]]:
+    video_id = UUID(video_data['id'])
+    video_row = (
+        video_id,
+        video_data['creator_id'],
+        parse_datetime(video_data['video_created_at']),
+        video_data.get('views_count', 0),
+        video_data.get('likes_count', 0),
+        video_data.get('comments_count', 0),
+        video_data.get('reports_count', 0),
+        parse_datetime(video_data['created_at']),
+        parse_datetime(video_data['updated_at']),
+    )
+    snapshot_rows = [
+        (
+            snapshot_data['id'],
+            video_id,
+            snapshot_data.get('views_count', 0),
+            snapshot_data.get('likes_count', 0),
+            snapshot_data.get('comments_count', 0),
+            snapshot_data.get('reports_count', 0),
+            snapshot_data.get('delta_views_count', 0),
+            snapshot_data.get('delta_likes_count', 0),
+            snapshot_data.get('delta_comments_count', 0),
+            snapshot_data.get('delta_reports_count', 0),
+            parse_datetime(snapshot_data['created_at']),
+            parse_datetime(snapshot_data['updated_at']),
+        )
+        for snapshot_data in video_data.get('snapshots', [])
+    ]
+    return video_row, snapshot_rows
+
+
+def transform_batch(raw_batch: List[Dict[str, Any]]) -> Tuple[List[tuple], List[tuple]]:
+    video_rows = []
+    snapshot_rows = []
+
+    for video_data in raw_batch:
+        try:
+            video_row, video_snapshot_rows = transform_video(video_data)
+        except Exception as e:
+            logger.error(f"Error processing video {video_data.get('id', 'unknown')}: {e}")
+            continue
+
+        video_rows.append(video_row)
+        snapshot_rows.extend(video_snapshot_rows)
+
+    return video_rows, snapshot_rows
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 
 class DataLoaderService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, batch_size: int = 100):
         self.db = db
+        self.batch_size = batch_size
 
-    async def load_from_json_file(self, json_file_path: str) -> Dict[str, int]:
+    async def load_from_json_file(
+        self,
+        json_file_path: str,
+        stream: bool = False,
+        bulk: bool = False,
+        incremental: bool = False,
+    ) -> Dict[str, int]:
         file_path = Path(json_file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"JSON file not found: {json_file_path}")
         
-        logger.info(f"Loading data from {json_file_path}")
+        logger.info(
+            f"Loading data from {json_file_path} "
+            f"(stream={stream}, bulk={bulk}, incremental={incremental})"
+        )
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        checkpoint = None
+        batch_size = self.batch_size
         
-        videos_data = data.get('videos', [])
-        
-        if not videos_data:
-            logger.warning("No videos found in JSON file")
-            return {'videos': 0, 'snapshots': 0}
+        if incremental:
+            checkpoint = await self._get_or_create_checkpoint(file_path)
+            if checkpoint.completed_at is not None:
+                logger.info(f"File {json_file_path} was already loaded at {checkpoint.completed_at}, skipping")
+                return {'videos': 0, 'snapshots': 0}
+            batch_size = checkpoint.batch_size
         
+        batches = batched(iter_videos(file_path, stream), batch_size)
+
+        if checkpoint is not None and checkpoint.batches_committed:
+            logger.info(f"Resuming {json_file_path} after {checkpoint.batches_committed} committed batches")
+            for _ in islice(batches, checkpoint.batches_committed):
+                pass
+
+        videos_seen = 0
         videos_loaded = 0
         snapshots_loaded = 0
-        
-        batch_size = 100
-        video_batch = []
-        snapshot_batch = []
-        
-        for video_data in videos_data:
-            try:
-                video_id = UUID(video_data['id'])
-                existing_video = await self.db.execute(
-                    select(Video).where(Video.id == video_id)
-                )
-                if existing_video.scalar_one_or_none():
-                    logger.debug(f"Video {video_id} already exists, skipping")
-                    continue
-                
-                video = Video(
-                    id=video_id,
-                    creator_id=video_data['creator_id'],
-                    video_created_at=self._parse_datetime(video_data['video_created_at']),
-                    views_count=video_data.get('views_count', 0),
-                    likes_count=video_data.get('likes_count', 0),
-                    comments_count=video_data.get('comments_count', 0),
-                    reports_count=video_data.get('reports_count', 0),
-                    created_at=self._parse_datetime(video_data['created_at']),
-                    updated_at=self._parse_datetime(video_data['updated_at']),
-                )
-                video_batch.append(video)
-                snapshots_data = video_data.get('snapshots', [])
-                for snapshot_data in snapshots_data:
-                    snapshot = VideoSnapshot(
-                        id=snapshot_data['id'],
-                        video_id=video_id,
-                        views_count=snapshot_data.get('views_count', 0),
-                        likes_count=snapshot_data.get('likes_count', 0),
-                        comments_count=snapshot_data.get('comments_count', 0),
-                        reports_count=snapshot_data.get('reports_count', 0),
-                        delta_views_count=snapshot_data.get('delta_views_count', 0),
-                        delta_likes_count=snapshot_data.get('delta_likes_count', 0),
-                        delta_comments_count=snapshot_data.get('delta_comments_count', 0),
-                        delta_reports_count=snapshot_data.get('delta_reports_count', 0),
-                        created_at=self._parse_datetime(snapshot_data['created_at']),
-                        updated_at=self._parse_datetime(snapshot_data['updated_at']),
-                    )
-                    snapshot_batch.append(snapshot)
-                
-                if len(video_batch) >= batch_size:
-                    await self._commit_batch(video_batch, snapshot_batch)
-                    videos_loaded += len(video_batch)
-                    snapshots_loaded += len(snapshot_batch)
-                    video_batch = []
-                    snapshot_batch = []
-                    logger.info(f"Loaded batch: {videos_loaded} videos, {snapshots_loaded} snapshots")
-                    
-            except Exception as e:
-                logger.error(f"Error processing video {video_data.get('id', 'unknown')}: {e}")
+
+        for raw_batch in batches:
+            videos_seen += len(raw_batch)
+
+            video_rows, snapshot_rows = transform_batch(raw_batch)
+            if not video_rows and checkpoint is None:
                 continue
+
+            videos_written, snapshots_written = await self.write_batch(
+                video_rows,
+                snapshot_rows,
+                bulk=bulk,
+                upsert=incremental,
+                checkpoint_key=checkpoint.file_key if checkpoint else None,
+            )
+            videos_loaded += videos_written
+            snapshots_loaded += snapshots_written
+            logger.info(f"Loaded batch: {videos_loaded} videos, {snapshots_loaded} snapshots")
+
+        if checkpoint is not None:
+            await self._complete_checkpoint(checkpoint.file_key)
+
+        if not videos_seen:
+            logger.warning("No videos found in JSON file")
+            return {'videos': 0, 'snapshots': 0}
         
-        if video_batch:
-            await self._commit_batch(video_batch, snapshot_batch)
-            videos_loaded += len(video_batch)
-            snapshots_loaded += len(snapshot_batch)
-        
-        logger.info(f"Data loading completed: {videos_loaded} videos, {snapshots_loaded} snapshots")
+        logger.info(
+            f"Data loading completed: {videos_loaded} videos, {snapshots_loaded} snapshots "
+            f"({videos_seen - videos_loaded} videos unchanged)"
+        )
         return {'videos': videos_loaded, 'snapshots': snapshots_loaded}
     
-    async def _commit_batch(
+    async def write_batch(
         self, 
-        video_batch: List[Video], 
-        snapshot_batch: List[VideoSnapshot]
-    ) -> None:
+        video_rows: List[tuple],
+        snapshot_rows: List[tuple],
+        bulk: bool = False,
+        upsert: bool = False,
+        checkpoint_key: Optional[str] = None,
+    ) -> Tuple[int, int]:
         try:
-            if video_batch:
-                self.db.add_all(video_batch)
-                await self.db.commit()
-                for video in video_batch:
-                    await self.db.refresh(video)
+            if bulk:
+                videos_written, snapshots_written = await self._copy_rows(video_rows, snapshot_rows, upsert)
+            else:
+                videos_written, snapshots_written = await self._insert_rows(video_rows, snapshot_rows, upsert)
             
-            if snapshot_batch:
-                self.db.add_all(snapshot_batch)
-                await self.db.commit()
-                for snapshot in snapshot_batch:
-                    await self.db.refresh(snapshot)
+            if checkpoint_key is not None:
+                await self.db.execute(
+                    update(LoadCheckpoint)
+                    .where(LoadCheckpoint.file_key == checkpoint_key)
+                    .values(
+                        batches_committed=LoadCheckpoint.batches_committed + 1,
+                        videos_loaded=LoadCheckpoint.videos_loaded + videos_written,
+                        snapshots_loaded=LoadCheckpoint.snapshots_loaded + snapshots_written,
+                    )
+                )
+
+            await self.db.commit()
+
+            return videos_written, snapshots_written
                 
         except Exception as e:
             await self.db.rollback()
-            logger.error(f"Error committing batch: {e}")
+            logger.error(f"Error writing batch: {e}")
             raise
     
-    def _parse_datetime(self, date_string: str) -> datetime:
-        if isinstance(date_string, datetime):
-            return date_string
-        return date_parser.parse(date_string)
+    async def _copy_rows(
+        self,
+        video_rows: List[tuple],
+        snapshot_rows: List[tuple],
+        upsert: bool,
+    ) -> Tuple[int, int]:
+        if not video_rows and not snapshot_rows:
+            return 0, 0
+
+        connection = await self.db.connection()
+        for statement in CREATE_STAGING_SQL:
+            await connection.execute(text(statement))
+
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if video_rows:
+            await driver_connection.copy_records_to_table(
+                VIDEOS_STAGING_TABLE, records=video_rows, columns=VIDEO_COLUMNS
+            )
+        if snapshot_rows:
+            await driver_connection.copy_records_to_table(
+                SNAPSHOTS_STAGING_TABLE, records=snapshot_rows, columns=SNAPSHOT_COLUMNS
+            )
+
+        videos_result = await connection.execute(text(UPSERT_VIDEOS_SQL if upsert else MERGE_VIDEOS_SQL))
+        snapshots_result = await connection.execute(text(MERGE_SNAPSHOTS_SQL))
+
+        return videos_result.rowcount, snapshots_result.rowcount
+
+    async def _insert_rows(
+        self,
+        video_rows: List[tuple],
+        snapshot_rows: List[tuple],
+        upsert: bool,
+    ) -> Tuple[int, int]:
+        videos_written = 0
+        if video_rows:
+            videos_written = await self._insert_videos(video_rows, upsert)
+
+        snapshots_written = 0
+        if snapshot_rows:
+            snapshots_result = await self.db.execute(
+                insert(snapshots_table)
+                .on_conflict_do_nothing(index_elements=[snapshots_table.c.id])
+                .returning(snapshots_table.c.id),
+                [dict(zip(SNAPSHOT_COLUMNS, row)) for row in snapshot_rows],
+            )
+            snapshots_written = len(snapshots_result.all())
+
+        return videos_written, snapshots_written
+
+    async def _insert_videos(self, video_rows: List[tuple], upsert: bool) -> int:
+        videos_stmt = insert(videos_table)
+        if upsert:
+            latest_rows = {}
+            for row in sorted(video_rows, key=lambda row: row[VIDEO_UPDATED_AT_INDEX]):
+                latest_rows[row[0]] = row
+            video_rows = list(latest_rows.values())
+            videos_stmt = videos_stmt.on_conflict_do_update(
+                index_elements=[videos_table.c.id],
+                set_={column: videos_stmt.excluded[column] for column in VIDEO_UPSERT_COLUMNS},
+                where=and_(
+                    videos_table.c.updated_at <= videos_stmt.excluded.updated_at,
+                    tuple_(*(videos_table.c[column] for column in VIDEO_COUNTER_COLUMNS)).is_distinct_from(
+                        tuple_(*(videos_stmt.excluded[column] for column in VIDEO_COUNTER_COLUMNS))
+                    ),
+                ),
+            )
+        else:
+            videos_stmt = videos_stmt.on_conflict_do_nothing(index_elements=[videos_table.c.id])
+
+        videos_result = await self.db.execute(
+            videos_stmt.returning(videos_table.c.id),
+            [dict(zip(VIDEO_COLUMNS, row)) for row in video_rows],
+        )
+        return len(videos_result.all())
+
+    async def _get_or_create_checkpoint(self, file_path: Path) -> LoadCheckpoint:
+        file_key = checkpoint_key(file_path)
+
+        await self.db.execute(
+            insert(LoadCheckpoint)
+            .values(file_key=file_key, file_path=str(file_path), batch_size=self.batch_size)
+            .on_conflict_do_nothing(index_elements=[LoadCheckpoint.file_key])
+        )
+        await self.db.commit()
+
+        result = await self.db.execute(
+            select(LoadCheckpoint).where(LoadCheckpoint.file_key == file_key)
+        )
+        return result.scalar_one()
 
+    async def _complete_checkpoint(self, file_key: str) -> None:
+        await self.db.execute(
+            update(LoadCheckpoint)
+            .where(LoadCheckpoint.file_key == file_key)
+            .values(completed_at=func.now())
+        )
+        await self.db.commit()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.ingest import IngestBatchAck, SnapshotIngest, VideoIngest
+from app.services.data_loader_service import SNAPSHOT_COLUMNS, VIDEO_COLUMNS, DataLoaderService
+
+RowBatch = Tuple[int, List[tuple], List[tuple]]
+
+
+class IngestError(ValueError):
+    def __init__(self, line: int, detail: str):
+        super().__init__(f"line {line}: {detail}")
+        self.line = line
+        self.detail = detail
+
+
+def _video_row(video: VideoIngest) -> tuple:
+    return tuple(getattr(video, column) for column in VIDEO_COLUMNS)
+
+
+def _snapshot_row(snapshot: SnapshotIngest, video_id: UUID) -> tuple:
+    return tuple(
+        video_id if column == 'video_id' else getattr(snapshot, column)
+        for column in SNAPSHOT_COLUMNS
+    )
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class NDJSONIngestService:
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = 500,
+        queue_size: int = 4,
+        max_line_bytes: int = 10 * 1024 * 1024,
+    ):
+        self.loader = DataLoaderService(db, batch_size=batch_size)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_line_bytes = max_line_bytes
+
+    async def ingest(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[IngestBatchAck]:
+        queue: asyncio.Queue[Optional[RowBatch]] = asyncio.Queue(maxsize=self.queue_size)
+        acks: asyncio.Queue[Optional[IngestBatchAck]] = asyncio.Queue()
+        writer = asyncio.create_task(self._write(queue, acks))
+        reader = asyncio.create_task(self._read(chunks, queue, writer))
+
+        try:
+            while (ack := await acks.get()) is not None:
+                yield ack
+
+            await asyncio.wait({writer})
+            writer.result()
+            await reader
+        finally:
+            for task in (reader, writer):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(reader, writer, return_exceptions=True)
+
+    async def _read(self, chunks: AsyncIterator[bytes], queue: asyncio.Queue, writer: asyncio.Task) -> None:
+        try:
+            async for batch in self._read_batches(chunks):
+                await self._put(queue, batch, writer)
+        finally:
+            if not writer.done():
+                await self._put(queue, None, writer)
+
+    async def _put(self, queue: asyncio.Queue, item: Optional[RowBatch], writer: asyncio.Task) -> None:
+        put = asyncio.ensure_future(queue.put(item))
+        done, _ = await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if put not in done:
+            put.cancel()
+            writer.result()
+            raise RuntimeError("Ingest writer stopped unexpectedly")
+
+    async def _write(self, queue: asyncio.Queue, acks: asyncio.Queue) -> None:
+        batches = 0
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+
+                last_line, video_rows, snapshot_rows = batch
+                try:
+                    videos, snapshots = await self.loader.write_batch(video_rows, snapshot_rows, upsert=True)
+                except IntegrityError as e:
+                    raise IngestError(last_line, f"batch rejected by the database: {e.orig}")
+
+                batches += 1
+                acks.put_nowait(IngestBatchAck(
+                    batch=batches,
+                    last_line=last_line,
+                    videos=videos,
+                    snapshots=snapshots,
+                ))
+                logger.info(f"Ingested batch {batches} up to line {last_line}: {videos} videos, {snapshots} snapshots")
+        finally:
+            acks.put_nowait(None)
+
+    async def _read_batches(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[RowBatch]:
+        video_rows: List[tuple] = []
+        snapshot_rows: List[tuple] = []
+        records = 0
+        last_line = 0
+
+        try:
+            async for line_no, line in self._iter_lines(chunks):
+                if not line.strip():
+                    continue
+
+                line_videos, line_snapshots = self._parse_line(line_no, line)
+                video_rows.extend(line_videos)
+                snapshot_rows.extend(line_snapshots)
+                records += 1
+                last_line = line_no
+
+                if records >= self.batch_size:
+                    yield last_line, video_rows, snapshot_rows
+                    video_rows, snapshot_rows, records = [], [], 0
+        except IngestError:
+            if records:
+                yield last_line, video_rows, snapshot_rows
+            raise
+
+        if records:
+            yield last_line, video_rows, snapshot_rows
+
+    async def _iter_lines(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+        pending: List[bytes] = []
+        pending_bytes = 0
+        line_no = 0
+
+        async for chunk in chunks:
+            *lines, tail = chunk.split(b"\n")
+            if lines:
+                lines[0] = b"".join(pending) + lines[0]
+                pending, pending_bytes = [], 0
+                for line in lines:
+                    line_no += 1
+                    yield line_no, line
+
+            if tail:
+                pending.append(tail)
+                pending_bytes += len(tail)
+            if pending_bytes > self.max_line_bytes:
+                raise IngestError(line_no + 1, f"line exceeds {self.max_line_bytes} bytes")
+
+        if pending:
+            yield line_no + 1, b"".join(pending)
+
+    def _parse_line(self, line_no: int, line: bytes) -> Tuple[List[tuple], List[tuple]]:
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise IngestError(line_no, f"invalid JSON: {e}")
+
+        if not isinstance(record, dict):
+            raise IngestError(line_no, "expected a JSON object")
+
+        try:
+            if 'creator_id' in record:
+                video = VideoIngest.model_validate(record)
+                return [_video_row(video)], [_snapshot_row(snapshot, video.id) for snapshot in video.snapshots]
+
+            snapshot = SnapshotIngest.model_validate(record)
+        except ValidationError as e:
+            raise IngestError(line_no, _format_validation_error(e))
+
+        if snapshot.video_id is None:
+            raise IngestError(line_no, "snapshot requires video_id")
+
+        return [], [_snapshot_row(snapshot, snapshot.video_id)]
@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services.data_loader_service import (
+    DataLoaderService,
+    batched,
+    iter_videos,
+    transform_batch,
+)
+
+RowBatch = Tuple[List[tuple], List[tuple]]
+
+
+class ParallelLoaderService:
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        workers: int,
+        writers: int,
+        batch_size: int = 1000,
+        bulk: bool = False,
+    ):
+        self.sessionmaker = sessionmaker
+        self.workers = workers
+        self.writers = writers
+        self.batch_size = batch_size
+        self.bulk = bulk
+
+    async def load_from_json_file(self, json_file_path: str, stream: bool = True) -> Dict[str, int]:
+        file_path = Path(json_file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"JSON file not found: {json_file_path}")
+
+        logger.info(
+            f"Loading data from {json_file_path} in parallel "
+            f"(workers={self.workers}, writers={self.writers}, bulk={self.bulk})"
+        )
+
+        totals = {'videos': 0, 'snapshots': 0}
+        queue: asyncio.Queue[Optional[RowBatch]] = asyncio.Queue(maxsize=self.writers * 2)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            tasks = [
+                asyncio.create_task(self._write(queue, totals))
+                for _ in range(self.writers)
+            ]
+            tasks.append(asyncio.create_task(self._produce(file_path, stream, pool, queue)))
+
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                task.result()
+
+        logger.info(f"Data loading completed: {totals['videos']} videos, {totals['snapshots']} snapshots")
+        return totals
+
+    async def _produce(
+        self,
+        file_path: Path,
+        stream: bool,
+        pool: ProcessPoolExecutor,
+        queue: asyncio.Queue,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        raw_batches = batched(iter_videos(file_path, stream), self.batch_size)
+        in_flight = set()
+
+        while True:
+            raw_batch = await loop.run_in_executor(None, next, raw_batches, None)
+            if raw_batch is None:
+                break
+
+            in_flight.add(loop.run_in_executor(pool, transform_batch, raw_batch))
+            if len(in_flight) >= self.workers * 2:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    await self._enqueue(queue, future.result())
+
+        for future in asyncio.as_completed(in_flight):
+            await self._enqueue(queue, await future)
+
+        for _ in range(self.writers):
+            await queue.put(None)
+
+    async def _enqueue(self, queue: asyncio.Queue, rows: RowBatch) -> None:
+        video_rows, _ = rows
+        if video_rows:
+            await queue.put(rows)
+
+    async def _write(self, queue: asyncio.Queue, totals: Dict[str, int]) -> None:
+        async with self.sessionmaker() as session:
+            loader = DataLoaderService(session, batch_size=self.batch_size)
+
+            while True:
+                rows = await queue.get()
+                if rows is None:
+                    return
+
+                video_rows, snapshot_rows = rows
+                videos_written, snapshots_written = await loader.write_batch(
+                    video_rows, snapshot_rows, self.bulk
+                )
+                totals['videos'] += videos_written
+                totals['snapshots'] += snapshots_written
+                logger.info(f"Loaded batch: {totals['videos']} videos, {totals['snapshots']} snapshots")
@@ -0,0 +1,44 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from app.utils.metrics import record_cache_lookup
+from app.utils.text import normalize_question
+
+PLAN_CACHE_PREFIX = "query:plan:"
+
+
+class PlanCache:
+    def __init__(self, redis: Redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, user_query: str) -> str:
+        digest = hashlib.sha1(normalize_question(user_query).encode()).hexdigest()
+        return f"{PLAN_CACHE_PREFIX}{datetime.now(timezone.utc).date().isoformat()}:{digest}"
+
+    async def get(self, user_query: str) -> Optional[Dict[str, Any]]:
+        if self.ttl <= 0:
+            return None
+
+        try:
+            value = await self.redis.get(self._key(user_query))
+        except Exception as e:
+            logger.warning(f"Plan cache lookup failed: {e}")
+            return None
+
+        record_cache_lookup("query_plan", value is not None)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, user_query: str, query_params: Dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+
+        try:
+            await self.redis.set(self._key(user_query), json.dumps(query_params, default=str), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Plan cache write failed: {e}")
@@ -0,0 +1,32 @@
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.utils.tracing import inject_context
+
+QUERY_RESULTS_STREAM = "bot:query_results"
+QUERY_RESULTS_MAXLEN = 10000
+
+
+async def publish_query_result(
+    redis: Redis,
+    chat_id: int,
+    job_id: str,
+    user_query: str,
+    result: Optional[int] = None,
+    error: Optional[str] = None,
+) -> str:
+    fields: Dict[str, str] = {
+        "chat_id": str(chat_id),
+        "job_id": job_id,
+        "query": user_query,
+        "status": "failed" if error is not None else "complete",
+    }
+    if result is not None:
+        fields["result"] = str(result)
+    if error is not None:
+        fields["error"] = error
+    fields.update(inject_context())
+    
+    entry_id = await redis.xadd(QUERY_RESULTS_STREAM, fields, maxlen=QUERY_RESULTS_MAXLEN, approximate=True)
+    return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
@@ -0,0 +1,114 @@
+import asyncio
+import copy
+from typing import Any, Dict, Optional
+
+from arq.connections import ArqRedis
+from fastapi import Request
+from loguru import logger
+
+from app.core.config import QueryExecutionMode, QuerySettings
+from app.db.database import get_async_sessionmaker
+from app.services.plan_cache_service import PlanCache
+from app.services.query_job_service import QueryJobService
+from app.utils.metrics import QUERY_PIPELINE_SECONDS, observe_seconds
+
+
+async def parse_query_plan(user_query: str) -> Dict[str, Any]:
+    from app.ml.llm import get_llm_service
+
+    return await asyncio.to_thread(get_llm_service().parse_query, user_query)
+
+
+async def execute_query_plan(
+    user_query: str,
+    query_params: Dict[str, Any],
+    plan_cache: Optional[PlanCache] = None,
+) -> int:
+    from app.services.query_service import QueryService
+
+    plan = copy.deepcopy(query_params)
+
+    async with get_async_sessionmaker()() as session:
+        query_service = QueryService(session)
+        result = await query_service.execute_query(query_params)
+
+    if plan_cache is not None:
+        await plan_cache.set(user_query, plan)
+    return result
+
+
+async def run_query_pipeline(
+    user_query: str,
+    query_params: Optional[Dict[str, Any]] = None,
+    plan_cache: Optional[PlanCache] = None,
+) -> int:
+    if query_params is not None:
+        return await execute_query_plan(user_query, query_params)
+
+    query_params = await parse_query_plan(user_query)
+    return await execute_query_plan(user_query, query_params, plan_cache)
+
+
+class QueryExecutor:
+    def __init__(
+        self,
+        pool: ArqRedis,
+        plan_cache: Optional[PlanCache] = None,
+        mode: QueryExecutionMode = QueryExecutionMode.QUEUE,
+        concurrency: int = 4,
+        result_timeout: float = 60.0,
+    ):
+        self.pool = pool
+        self.plan_cache = plan_cache
+        self.mode = mode
+        self.concurrency = concurrency
+        self.result_timeout = result_timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.inline_in_flight = 0
+
+    @classmethod
+    def from_settings(cls, pool: ArqRedis, settings: QuerySettings) -> "QueryExecutor":
+        return cls(
+            pool,
+            plan_cache=PlanCache(pool, settings.query_plan_cache_ttl),
+            mode=settings.query_execution_mode,
+            concurrency=settings.query_inline_concurrency,
+            result_timeout=settings.query_result_timeout,
+        )
+
+    def has_inline_capacity(self) -> bool:
+        return self.mode == QueryExecutionMode.INLINE and not self.semaphore.locked()
+
+    async def run(self, user_query: str) -> int:
+        if self.has_inline_capacity():
+            return await self.run_inline(user_query)
+
+        if self.mode == QueryExecutionMode.INLINE:
+            logger.info("Inline query capacity saturated, spilling over to the queue")
+        return await self.run_queued(user_query)
+
+    async def run_inline(self, user_query: str) -> int:
+        async with self.semaphore:
+            self.inline_in_flight += 1
+            try:
+                query_params = await self.plan_cache.get(user_query) if self.plan_cache else None
+                with observe_seconds(QUERY_PIPELINE_SECONDS, mode="inline"):
+                    return await run_query_pipeline(user_query, query_params, self.plan_cache)
+            finally:
+                self.inline_in_flight -= 1
+
+    async def run_queued(self, user_query: str) -> int:
+        job_service = QueryJobService(self.pool, self.plan_cache)
+        job_id = await job_service.enqueue(user_query)
+        return await job_service.result(job_id, timeout=self.result_timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode.value,
+            "inline_concurrency": self.concurrency,
+            "inline_in_flight": self.inline_in_flight,
+        }
+
+
+def get_query_executor(request: Request) -> QueryExecutor:
+    return request.app.state.query_executor
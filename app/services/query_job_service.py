@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from arq.connections import ArqRedis
+from arq.constants import default_queue_name, result_key_prefix
+from arq.jobs import Job, JobStatus, serialize_result
+from arq.utils import timestamp_ms
+from loguru import logger
+
+from app.schemas.query import QueryJobResponse, QueryJobStatus
+from app.services.plan_cache_service import PlanCache
+from app.utils.metrics import QUERY_JOBS_ENQUEUED_TOTAL
+from app.utils.tracing import inject_context, tracer
+
+PARSE_TASK_NAME = "parse_query_task"
+EXECUTE_TASK_NAME = "execute_query_task"
+PARSE_QUEUE_NAME = default_queue_name
+EXECUTE_QUEUE_NAME = f"{default_queue_name}:execute"
+PARSE_JOB_SUFFIX = ":parse"
+JOB_RESULT_TTL_SECONDS = 3600
+
+
+class QueryJobNotFound(LookupError):
+    pass
+
+
+def parse_job_id(job_id: str) -> str:
+    return f"{job_id}{PARSE_JOB_SUFFIX}"
+
+
+class QueryJobService:
+    def __init__(self, pool: ArqRedis, plan_cache: Optional[PlanCache] = None, poll_delay: float = 0.2):
+        self.pool = pool
+        self.plan_cache = plan_cache
+        self.poll_delay = poll_delay
+
+    async def enqueue(self, user_query: str, reply_chat_id: Optional[int] = None) -> str:
+        job_id = uuid4().hex
+
+        with tracer.start_as_current_span("query.enqueue", attributes={"job.id": job_id}) as span:
+            query_params = await self.plan_cache.get(user_query) if self.plan_cache else None
+            span.set_attribute("query.plan_cached", query_params is not None)
+
+            if query_params is not None:
+                job = await self.enqueue_execute(job_id, user_query, query_params, reply_chat_id)
+            else:
+                job = await self.pool.enqueue_job(
+                    PARSE_TASK_NAME,
+                    user_query,
+                    reply_chat_id=reply_chat_id,
+                    trace_context=inject_context() or None,
+                    _job_id=parse_job_id(job_id),
+                    _queue_name=PARSE_QUEUE_NAME,
+                )
+                QUERY_JOBS_ENQUEUED_TOTAL.labels(queue=PARSE_QUEUE_NAME).inc()
+
+        if job is None:
+            raise RuntimeError("Query job was not enqueued")
+
+        logger.info(f"Query job {job_id} enqueued as {job.job_id}")
+        return job_id
+
+    async def enqueue_execute(
+        self,
+        job_id: str,
+        user_query: str,
+        query_params: Dict[str, Any],
+        reply_chat_id: Optional[int] = None,
+        cache_plan: bool = False,
+    ) -> Optional[Job]:
+        job = await self.pool.enqueue_job(
+            EXECUTE_TASK_NAME,
+            user_query,
+            query_params,
+            reply_chat_id=reply_chat_id,
+            cache_plan=cache_plan,
+            trace_context=inject_context() or None,
+            _job_id=job_id,
+            _queue_name=EXECUTE_QUEUE_NAME,
+        )
+        if job is not None:
+            QUERY_JOBS_ENQUEUED_TOTAL.labels(queue=EXECUTE_QUEUE_NAME).inc()
+        return job
+
+    async def store_result(self, job_id: str, user_query: str, result: Any, success: bool, started_ms: int) -> None:
+        data = serialize_result(
+            EXECUTE_TASK_NAME,
+            (user_query,),
+            {},
+            1,
+            started_ms,
+            success,
+            result,
+            started_ms,
+            timestamp_ms(),
+            f"{job_id}:{EXECUTE_TASK_NAME}",
+            EXECUTE_QUEUE_NAME,
+            job_id,
+            serializer=self.pool.job_serializer,
+        )
+        if data is None:
+            return
+
+        try:
+            await self.pool.set(f"{result_key_prefix}{job_id}", data, ex=JOB_RESULT_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to store result of inline query job {job_id}: {e}")
+
+    async def submit(self, user_query: str, reply_chat_id: Optional[int] = None) -> QueryJobResponse:
+        job_id = await self.enqueue(user_query, reply_chat_id)
+        return QueryJobResponse(job_id=job_id, status=QueryJobStatus.QUEUED)
+
+    async def result(self, job_id: str, timeout: float) -> int:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        parse_job = Job(parse_job_id(job_id), self.pool, _queue_name=PARSE_QUEUE_NAME)
+        if await parse_job.status() != JobStatus.not_found:
+            await parse_job.result(timeout=timeout, poll_delay=self.poll_delay)
+
+        execute_job = Job(job_id, self.pool, _queue_name=EXECUTE_QUEUE_NAME)
+        return await execute_job.result(timeout=max(0.0, deadline - loop.time()), poll_delay=self.poll_delay)
+
+    async def get(self, job_id: str, wait: float = 0) -> QueryJobResponse:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+
+        parse_job = Job(parse_job_id(job_id), self.pool, _queue_name=PARSE_QUEUE_NAME)
+        parse_status = await self._wait_for_completion(parse_job, wait)
+
+        if parse_status not in (JobStatus.complete, JobStatus.not_found):
+            return QueryJobResponse(job_id=job_id, status=self._pending_status(parse_status))
+
+        if parse_status == JobStatus.complete:
+            info = await parse_job.result_info()
+            if info is not None and not info.success:
+                return QueryJobResponse(
+                    job_id=job_id,
+                    status=QueryJobStatus.FAILED,
+                    error=self._format_error(info.result),
+                )
+
+        job = Job(job_id, self.pool, _queue_name=EXECUTE_QUEUE_NAME)
+        status = await self._wait_for_completion(job, max(0.0, deadline - loop.time()))
+
+        if status == JobStatus.not_found:
+            raise QueryJobNotFound(job_id)
+
+        if status != JobStatus.complete:
+            return QueryJobResponse(job_id=job_id, status=self._pending_status(status))
+
+        info = await job.result_info()
+        if info is None:
+            raise QueryJobNotFound(job_id)
+
+        if info.success:
+            return QueryJobResponse(job_id=job_id, status=QueryJobStatus.COMPLETE, result=info.result)
+
+        return QueryJobResponse(
+            job_id=job_id,
+            status=QueryJobStatus.FAILED,
+            error=self._format_error(info.result),
+        )
+
+    async def _wait_for_completion(self, job: Job, wait: float) -> JobStatus:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        status = await job.status()
+
+        while status not in (JobStatus.complete, JobStatus.not_found) and loop.time() < deadline:
+            await asyncio.sleep(min(self.poll_delay, max(0.0, deadline - loop.time())))
+            status = await job.status()
+
+        return status
+
+    def _pending_status(self, status: JobStatus) -> QueryJobStatus:
+        return QueryJobStatus.IN_PROGRESS if status == JobStatus.in_progress else QueryJobStatus.QUEUED
+
+    def _format_error(self, error: Optional[BaseException]) -> str:
+        if isinstance(error, ValueError):
+            return str(error)
+        return "Failed to process query"
@@ -2,13 +2,14 @@ from datetime import datetime, timedelta
 from typing import Any, Dict
 import re
 
-import dateparser
 from loguru import logger
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.videos import Video
 from app.models.video_snapshots import VideoSnapshot
+from app.utils.metrics import SQL_EXECUTION_SECONDS, observe_seconds, plan_shape, record_error
+from app.utils.tracing import tracer
 
 
 class QueryService:
@@ -16,6 +17,19 @@ class QueryService:
         self.db = db
     
     async def execute_query(self, query_params: Dict[str, Any]) -> int:
+        shape = plan_shape(query_params)
+        try:
+            with tracer.start_as_current_span(
+                "db.execute_query",
+                attributes={"db.system": "postgresql", "query.plan_shape": shape},
+            ):
+                with observe_seconds(SQL_EXECUTION_SECONDS, plan_shape=shape):
+                    return await self._execute_query(query_params)
+        except Exception as e:
+            record_error("sql", e)
+            raise
+    
+    async def _execute_query(self, query_params: Dict[str, Any]) -> int:
         query_type = query_params.get("query_type")
         table = query_params.get("table")
         
@@ -253,6 +267,8 @@ class QueryService:
         except ValueError:
             pass
         
+        import dateparser
+        
         parsed = dateparser.parse(date_str, languages=["ru"])
         if parsed is None:
             raise ValueError(f"Не удалось распарсить дату: {date_str}")
@@ -0,0 +1,143 @@
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from arq.connections import ArqRedis
+from fastapi import Header, HTTPException, Request, status
+from loguru import logger
+
+from app.core.config import RateLimitSettings
+from app.services.query_executor import get_query_executor
+from app.services.query_job_service import EXECUTE_QUEUE_NAME, PARSE_QUEUE_NAME
+
+CLIENT_BUCKET_PREFIX = "ratelimit:client:"
+GLOBAL_BUCKET_KEY = "ratelimit:global"
+
+ADMIT_SCRIPT = """
+redis.replicate_commands()
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local cost = tonumber(ARGV[5])
+local max_depth = tonumber(ARGV[6])
+
+if max_depth > 0 then
+    local depth = 0
+    for i = 3, #KEYS do
+        depth = depth + redis.call('ZCARD', KEYS[i])
+    end
+    if depth >= max_depth then
+        return {0, 'queue', 1000}
+    end
+end
+
+local function refill(key, capacity, rate)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, tokens + math.max(0, now - ts) * rate)
+end
+
+local function store(key, tokens, capacity, rate)
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+
+local chat_capacity, chat_rate = tonumber(ARGV[1]), tonumber(ARGV[2])
+local global_capacity, global_rate = tonumber(ARGV[3]), tonumber(ARGV[4])
+
+local chat_tokens = refill(KEYS[1], chat_capacity, chat_rate)
+if chat_tokens < cost then
+    return {0, 'chat', math.ceil((cost - chat_tokens) / chat_rate * 1000)}
+end
+
+local global_tokens = refill(KEYS[2], global_capacity, global_rate)
+if global_tokens < cost then
+    return {0, 'global', math.ceil((cost - global_tokens) / global_rate * 1000)}
+end
+
+store(KEYS[1], chat_tokens - cost, chat_capacity, chat_rate)
+store(KEYS[2], global_tokens - cost, global_capacity, global_rate)
+return {1, '', 0}
+"""
+
+
+@dataclass
+class AdmissionDecision:
+    allowed: bool
+    reason: str = ""
+    retry_after_ms: int = 0
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        redis: ArqRedis,
+        settings: RateLimitSettings,
+        bot_token: str,
+        queue_names: Sequence[str] = (PARSE_QUEUE_NAME, EXECUTE_QUEUE_NAME),
+    ):
+        self.redis = redis
+        self.settings = settings
+        self.bot_token = bot_token
+        self.queue_names = list(queue_names)
+        self._admit = redis.register_script(ADMIT_SCRIPT)
+
+    async def admit(self, client_key: str, check_queue: bool = True, cost: int = 1) -> AdmissionDecision:
+        allowed, reason, retry_after_ms = await self._admit(
+            keys=[CLIENT_BUCKET_PREFIX + client_key, GLOBAL_BUCKET_KEY, *self.queue_names],
+            args=[
+                self.settings.rate_limit_chat_capacity,
+                self.settings.rate_limit_chat_refill_per_second,
+                self.settings.rate_limit_global_capacity,
+                self.settings.rate_limit_global_refill_per_second,
+                cost,
+                self.settings.query_max_queue_depth if check_queue else 0,
+            ],
+        )
+        if isinstance(reason, bytes):
+            reason = reason.decode()
+        return AdmissionDecision(allowed=bool(allowed), reason=reason, retry_after_ms=int(retry_after_ms))
+
+
+def get_rate_limiter(request: Request) -> Optional[RateLimiter]:
+    return request.app.state.rate_limiter
+
+
+def _client_key(request: Request, limiter: RateLimiter, chat_id: Optional[int], bot_token: Optional[str]) -> str:
+    if chat_id is not None and bot_token == limiter.bot_token:
+        return f"chat:{chat_id}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+async def admit_query(
+    request: Request,
+    x_telegram_chat_id: Optional[int] = Header(None, alias="X-Telegram-Chat-Id"),
+    x_bot_token: Optional[str] = Header(None, alias="X-Bot-Token"),
+) -> None:
+    limiter = get_rate_limiter(request)
+    if limiter is None:
+        return
+
+    client_key = _client_key(request, limiter, x_telegram_chat_id, x_bot_token)
+    check_queue = not get_query_executor(request).has_inline_capacity()
+    decision = await limiter.admit(client_key, check_queue=check_queue)
+
+    if decision.allowed:
+        return
+
+    retry_after = str(max(1, math.ceil(decision.retry_after_ms / 1000)))
+    logger.warning(f"Query rejected for {client_key}: {decision.reason} limit, retry after {retry_after}s")
+
+    if decision.reason == "queue":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Query queue is full",
+            headers={"Retry-After": retry_after},
+        )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Rate limit exceeded ({decision.reason})",
+        headers={"Retry-After": retry_after},
+    )
@@ -1,22 +1,115 @@
-from typing import Optional, Tuple
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
 from uuid import UUID
 
+from fastapi import Request
 from loguru import logger
-from sqlalchemy import select
+from redis.asyncio import Redis
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.users import Users
+from app.utils.cache import TTLCache
+from app.utils.metrics import record_cache_lookup
+
+TELEGRAM_USER_KEY_PREFIX = "telegram:user:"
+
+
+@dataclass(frozen=True)
+class TelegramUser:
+    id: UUID
+    telegram_chat_id: int
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, user: Users) -> "TelegramUser":
+        return cls(
+            id=user.id,
+            telegram_chat_id=user.telegram_chat_id,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+def _user_to_cache(user: Union[Users, TelegramUser]) -> Dict[str, Any]:
+    return {
+        "id": str(user.id),
+        "telegram_chat_id": user.telegram_chat_id,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+    }
+
+
+def _user_from_cache(data: Dict[str, Any]) -> TelegramUser:
+    return TelegramUser(
+        id=UUID(data["id"]),
+        telegram_chat_id=data["telegram_chat_id"],
+        is_active=data["is_active"],
+        created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+        updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+    )
+
+
+class TelegramUserCache:
+    def __init__(self, redis: Optional[Redis], ttl: int, local_ttl: float, local_size: int):
+        self.redis = redis
+        self.ttl = ttl
+        self.local = TTLCache(max_size=local_size, ttl=local_ttl)
+
+    async def get(self, telegram_chat_id: int) -> Optional[Dict[str, Any]]:
+        data = self.local.get(telegram_chat_id)
+        record_cache_lookup("telegram_user_local", data is not None)
+        if data is not None or self.redis is None:
+            return data
+
+        try:
+            raw = await self.redis.get(f"{TELEGRAM_USER_KEY_PREFIX}{telegram_chat_id}")
+        except Exception as e:
+            logger.warning(f"Telegram user cache read failed: {e}")
+            return None
+
+        record_cache_lookup("telegram_user_redis", raw is not None)
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        self.local.set(telegram_chat_id, data)
+        return data
+
+    async def set(self, user: Users) -> None:
+        data = _user_to_cache(user)
+        self.local.set(user.telegram_chat_id, data)
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.set(
+                f"{TELEGRAM_USER_KEY_PREFIX}{user.telegram_chat_id}",
+                json.dumps(data),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Telegram user cache write failed: {e}")
+
+
+def get_telegram_user_cache(request: Request) -> Optional[TelegramUserCache]:
+    return getattr(request.app.state, "telegram_user_cache", None)
 
 
 class TelegramService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: Optional[TelegramUserCache] = None):
         self.db = db
+        self.cache = cache
 
     async def get_user_by_chat_id(self, telegram_chat_id: int) -> Optional[UUID]:
-        result = await self.db.execute(
-            select(Users).where(Users.telegram_chat_id == telegram_chat_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await self.get_user_by_chat_id_cached(telegram_chat_id)
         return user.id if user else None
 
     async def get_user_by_chat_id_full(self, telegram_chat_id: int) -> Optional[Users]:
@@ -25,29 +118,44 @@ class TelegramService:
         )
         return result.scalar_one_or_none()
 
+    async def get_user_by_chat_id_cached(self, telegram_chat_id: int) -> Optional[TelegramUser]:
+        if self.cache is not None:
+            data = await self.cache.get(telegram_chat_id)
+            if data is not None:
+                return _user_from_cache(data)
+
+        user = await self.get_user_by_chat_id_full(telegram_chat_id)
+        if user is None:
+            return None
+        if self.cache is not None:
+            await self.cache.set(user)
+        return TelegramUser.from_model(user)
+
     async def create_or_get_telegram_user(
         self,
         telegram_chat_id: int,
         telegram_user_id: Optional[int] = None,
         telegram_username: Optional[str] = None,
     ) -> Tuple[Users, bool]:
-        user = await self.get_user_by_chat_id_full(telegram_chat_id)
-        
-        if user:
-            logger.info(f"Found existing user {user.id} for chat {telegram_chat_id}")
-            return user, False
-        
-        logger.info(f"Creating new user for chat {telegram_chat_id}")
-        
-        new_user = Users(
-            telegram_chat_id=telegram_chat_id,
-            is_active=True,
+        stmt = insert(Users).values(telegram_chat_id=telegram_chat_id, is_active=True)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[Users.telegram_chat_id],
+                set_={"telegram_chat_id": stmt.excluded.telegram_chat_id},
+            )
+            .returning(Users, literal_column("xmax = 0").label("inserted"))
+            .execution_options(populate_existing=True)
         )
-        
-        self.db.add(new_user)
+        result = await self.db.execute(stmt)
+        user, is_new = result.one()
         await self.db.commit()
-        await self.db.refresh(new_user)
         
-        logger.info(f"Created new user {new_user.id} for chat {telegram_chat_id}")
+        if is_new:
+            logger.info(f"Created new user {user.id} for chat {telegram_chat_id}")
+        else:
+            logger.info(f"Found existing user {user.id} for chat {telegram_chat_id}")
+        
+        if self.cache is not None:
+            await self.cache.set(user)
         
-        return new_user, True
+        return user, is_new
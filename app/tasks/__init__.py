@@ -1,4 +1,3 @@
-from .query_task import process_query_task
-
-__all__ = ["process_query_task"]
+from .query_task import execute_query_task, parse_query_task
 
+__all__ = ["parse_query_task", "execute_query_task"]
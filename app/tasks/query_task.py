@@ -1,37 +1,125 @@
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 
 from loguru import logger
+from opentelemetry.context import Context
+from opentelemetry.trace import SpanKind
 
-from app.core.config import GigaChatSettings
-from app.db.database import get_async_sessionmaker
-from app.ml.llm import LLMService
-from app.services.query_service import QueryService
+from app.services.query_delivery_service import publish_query_result
+from app.services.query_executor import execute_query_plan, parse_query_plan
+from app.services.query_job_service import PARSE_JOB_SUFFIX, QueryJobService
+from app.utils.metrics import (
+    QUERY_QUEUE_WAIT_SECONDS,
+    QUERY_STAGE_SECONDS,
+    observe_seconds,
+    record_error,
+)
+from app.utils.tracing import extract_context, tracer
 
 
-async def process_query_task(
+async def parse_query_task(
     ctx: Dict[str, Any],
-    user_query: str
-) -> int:
-    llm_settings = GigaChatSettings()
-    llm_service = LLMService(llm_settings)
-    
-    sessionmaker = get_async_sessionmaker()
+    user_query: str,
+    reply_chat_id: Optional[int] = None,
+    trace_context: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    job_id = ctx["job_id"].removesuffix(PARSE_JOB_SUFFIX)
+    parent = extract_context(trace_context)
+    _observe_queue_wait(ctx, "parse", parent)
     
-    try:
-        async with sessionmaker() as session:
-            query_params = llm_service.parse_query(user_query)
+    with tracer.start_as_current_span(
+        "parse_query_task", context=parent, kind=SpanKind.CONSUMER, attributes={"job.id": job_id}
+    ):
+        try:
+            with observe_seconds(QUERY_STAGE_SECONDS, stage="parse"):
+                query_params = await parse_query_plan(user_query)
             
-            query_service = QueryService(session)
-            result = await query_service.execute_query(query_params)
-            
-            logger.info(f"Query processed successfully: {user_query[:50]}... -> {result}")
+            await QueryJobService(ctx["redis"]).enqueue_execute(
+                job_id, user_query, query_params, reply_chat_id, cache_plan=True
+            )
+            logger.info(f"Query parsed: {user_query[:50]}... -> job {job_id}")
             
-            return result
+            return query_params
+        
+        except ValueError as e:
+            record_error("task", e)
+            logger.error(f"Validation error parsing query: {e}")
+            await _deliver(ctx, job_id, reply_chat_id, user_query, error=str(e))
+            raise
+        except Exception as e:
+            record_error("task", e)
+            logger.exception(f"Error parsing query: {e}")
+            await _deliver(ctx, job_id, reply_chat_id, user_query, error="Failed to process query")
+            raise
+
+
+async def execute_query_task(
+    ctx: Dict[str, Any],
+    user_query: str,
+    query_params: Dict[str, Any],
+    reply_chat_id: Optional[int] = None,
+    cache_plan: bool = False,
+    trace_context: Optional[Dict[str, str]] = None,
+) -> int:
+    job_id = ctx["job_id"]
+    parent = extract_context(trace_context)
+    _observe_queue_wait(ctx, "execute", parent)
+    
+    with tracer.start_as_current_span(
+        "execute_query_task", context=parent, kind=SpanKind.CONSUMER, attributes={"job.id": job_id}
+    ):
+        try:
+            with observe_seconds(QUERY_STAGE_SECONDS, stage="execute"):
+                result = await execute_query_plan(
+                    user_query, query_params, ctx.get("plan_cache") if cache_plan else None
+                )
             
-    except ValueError as e:
-        logger.error(f"Validation error processing query: {e}")
-        raise
-    except Exception as e:
-        logger.exception(f"Error processing query: {e}")
-        raise
+            logger.info(f"Query processed successfully: {user_query[:50]}... -> {result}")
+                
+        except ValueError as e:
+            record_error("task", e)
+            logger.error(f"Validation error processing query: {e}")
+            await _deliver(ctx, job_id, reply_chat_id, user_query, error=str(e))
+            raise
+        except Exception as e:
+            record_error("task", e)
+            logger.exception(f"Error processing query: {e}")
+            await _deliver(ctx, job_id, reply_chat_id, user_query, error="Failed to process query")
+            raise
+        
+        await _deliver(ctx, job_id, reply_chat_id, user_query, result=result)
+        return result
+
+
+def _observe_queue_wait(ctx: Dict[str, Any], queue: str, parent: Context) -> None:
+    enqueue_time = ctx.get("enqueue_time")
+    if enqueue_time is not None:
+        QUERY_QUEUE_WAIT_SECONDS.labels(queue=queue).observe(
+            max(0.0, (datetime.now(timezone.utc) - enqueue_time).total_seconds())
+        )
+        tracer.start_span(
+            "arq.queue_wait",
+            context=parent,
+            attributes={"arq.queue": queue, "job.id": ctx["job_id"]},
+            start_time=int(enqueue_time.timestamp() * 1e9),
+        ).end()
+
 
+async def _deliver(
+    ctx: Dict[str, Any],
+    job_id: str,
+    reply_chat_id: Optional[int],
+    user_query: str,
+    result: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    if reply_chat_id is None:
+        return
+    
+    try:
+        await publish_query_result(
+            ctx["redis"], reply_chat_id, job_id, user_query, result=result, error=error
+        )
+    except Exception as e:
+        record_error("delivery", e)
+        logger.exception(f"Failed to publish result of job {job_id} for chat {reply_chat_id}: {e}")
@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SHAPE_FILTERS = ("creator_id", "date", "date_from", "time_from", "metric_gt", "metric_lt", "metric_eq")
+
+QUERY_QUEUE_WAIT_SECONDS = Histogram(
+    "query_queue_wait_seconds",
+    "Time a query job spent in the arq queue before a worker picked it up",
+    ["queue"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds",
+    "Latency of the LLM call that turns a question into a query plan",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+PLAN_VALIDATION_SECONDS = Histogram(
+    "query_plan_validation_seconds",
+    "Time spent extracting, repairing and validating the LLM query plan",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1),
+)
+SQL_EXECUTION_SECONDS = Histogram(
+    "query_sql_execution_seconds",
+    "SQL execution time of a query plan",
+    ["plan_shape"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_STAGE_SECONDS = Histogram(
+    "query_stage_seconds",
+    "Time a worker spent in one stage of a query job",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_PIPELINE_SECONDS = Histogram(
+    "query_pipeline_seconds",
+    "End-to-end time of the parse and execute pipeline",
+    ["mode"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_JOBS_ENQUEUED_TOTAL = Counter(
+    "query_jobs_enqueued_total",
+    "Query jobs enqueued, by the queue they were routed to",
+    ["queue"],
+)
+QUERY_ERRORS_TOTAL = Counter(
+    "query_errors_total",
+    "Query pipeline errors by stage and exception type",
+    ["stage", "error_type"],
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result",
+    ["cache", "result"],
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_connections_in_use",
+    "Database connections currently checked out",
+)
+DB_CONNECTIONS_OPENED_TOTAL = Counter(
+    "db_connections_opened_total",
+    "Database connections opened",
+)
+REDIS_POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections",
+    "Connections in the shared ARQ Redis pool by state",
+    ["state"],
+)
+
+
+def plan_shape(query_params: Dict[str, Any]) -> str:
+    filters = query_params.get("filters") or {}
+    parts = [str(query_params.get("query_type")), str(query_params.get("table"))]
+    parts.extend(key for key in SHAPE_FILTERS if key in filters)
+    if any(key.startswith("delta_") for key in filters):
+        parts.append("delta")
+    return ":".join(parts)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "connect", lambda *args: DB_CONNECTIONS_OPENED_TOTAL.inc())
+    event.listen(engine.sync_engine, "checkout", lambda *args: DB_CONNECTIONS_IN_USE.inc())
+    event.listen(engine.sync_engine, "checkin", lambda *args: DB_CONNECTIONS_IN_USE.dec())
+
+
+def record_error(stage: str, error: BaseException) -> None:
+    QUERY_ERRORS_TOTAL.labels(stage=stage, error_type=type(error).__name__).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS_TOTAL.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+@contextmanager
+def observe_seconds(histogram: Histogram, **labels: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started_at)
@@ -8,21 +8,18 @@ import jwt
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional
-from app.core.config import JWTSettings, TelegramSettings
+from typing import Optional, Union
+from app.core.config import JWTSettings, TelegramSettings, get_settings
 from app.db.database import get_db
 from app.models.users import Users
 from app.schemas.token import Token  
-from app.services.telegram_service import TelegramService
+from app.services.telegram_service import TelegramService, TelegramUser, get_telegram_user_cache
 
 auth_scheme = APIKeyHeader(name="Authorization", scheme_name="Bearer", auto_error=False)
 
-jwt_settings = JWTSettings()
-telegram_settings = TelegramSettings()
-
 
 async def verify_bot_token(x_bot_token: Optional[str] = Header(None, alias="X-Bot-Token")) -> str:
-    if not x_bot_token or x_bot_token != telegram_settings.bot_token:
+    if not x_bot_token or x_bot_token != get_settings(TelegramSettings).bot_token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid bot token",
@@ -30,6 +27,7 @@ async def verify_bot_token(x_bot_token: Optional[str] = Header(None, alias="X-Bo
     return x_bot_token
 
 async def create_access_token(to_encode: dict):
+    jwt_settings = get_settings(JWTSettings)
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=jwt_settings.access_token_expire_minutes
     )
@@ -42,6 +40,7 @@ async def create_access_token(to_encode: dict):
     return encoded_jwt
 
 async def create_refresh_token(to_encode: dict):
+    jwt_settings = get_settings(JWTSettings)
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=jwt_settings.refresh_token_expire_minutes
     )
@@ -63,6 +62,7 @@ async def verify_token(token:str, secret_key:str, algorithm:str):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
 
 async def refresh_access_token(refresh_token: str):
+    jwt_settings = get_settings(JWTSettings)
     try:
         refresh_token_payload = await verify_token(
             refresh_token, 
@@ -101,6 +101,7 @@ async def get_current_user(request: Request, token: str = Depends(auth_scheme),
         if token.startswith("Bearer "):
             token = token[7:]
         
+        jwt_settings = get_settings(JWTSettings)
         payload = await verify_token(token, jwt_settings.secret_key, jwt_settings.algorithm)
         user_id: str = payload.get("id")
         if user_id is None:
@@ -128,13 +129,13 @@ async def get_user_from_telegram(
     x_bot_token: Optional[str] = Header(None, alias="X-Bot-Token"),
     x_telegram_chat_id: Optional[int] = Header(None, alias="X-Telegram-Chat-Id"),
     db: AsyncSession = Depends(get_db),
-) -> Users:
+) -> TelegramUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate telegram credentials",
     )
 
-    if not x_bot_token or x_bot_token != telegram_settings.bot_token:
+    if not x_bot_token or x_bot_token != get_settings(TelegramSettings).bot_token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid bot token",
@@ -143,8 +144,8 @@ async def get_user_from_telegram(
     if not x_telegram_chat_id:
         raise credentials_exception
 
-    telegram_service = TelegramService(db)
-    user = await telegram_service.get_user_by_chat_id_full(x_telegram_chat_id)
+    telegram_service = TelegramService(db, get_telegram_user_cache(request))
+    user = await telegram_service.get_user_by_chat_id_cached(x_telegram_chat_id)
 
     if not user:
         raise HTTPException(
@@ -160,7 +161,7 @@ async def get_user(
     x_bot_token: Optional[str] = Header(None, alias="X-Bot-Token"),
     x_telegram_chat_id: Optional[int] = Header(None, alias="X-Telegram-Chat-Id"),
     db: AsyncSession = Depends(get_db),
-) -> Users:
+) -> Union[Users, TelegramUser]:
     if x_bot_token:
         return await get_user_from_telegram(request, x_bot_token, x_telegram_chat_id, db)
     else:
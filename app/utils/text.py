@@ -0,0 +1,9 @@
+import re
+
+TRAILING_PUNCTUATION = "?!.…"
+
+
+def normalize_question(text: str) -> str:
+    normalized = text.casefold().replace("ё", "е")
+    normalized = re.sub(r"\s+", " ", normalized).strip()
+    return normalized.rstrip(TRAILING_PUNCTUATION).rstrip()
@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, TextIO
+
+from loguru import logger
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.trace import SpanKind
+
+from app.core.config import TracingExporter, TracingSettings, get_settings
+
+tracer = trace.get_tracer("rlt")
+_trace_file: Optional[TextIO] = None
+
+
+def setup_tracing(service_name: str) -> None:
+    global _trace_file
+
+    settings = get_settings(TracingSettings)
+    if settings.tracing_exporter == TracingExporter.NONE:
+        return
+
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if settings.tracing_exporter == TracingExporter.OTLP:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+        destination = settings.tracing_otlp_endpoint
+    else:
+        path = Path(settings.tracing_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _trace_file = open(path, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(
+            out=_trace_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+        destination = str(path)
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing enabled for {service_name}, exporting to {destination}")
+
+
+def shutdown_tracing() -> None:
+    global _trace_file
+
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+    if _trace_file is not None:
+        _trace_file.close()
+        _trace_file = None
+
+
+def inject_context() -> Dict[str, str]:
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Mapping[str, str]]) -> Context:
+    return propagate.extract(carrier or {})
+
+
+class TracingMiddleware:
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=extract_context(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            async def send_with_status(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+            route = scope.get("route")
+            if route is not None:
+                span.update_name(f"{method} {route.path}")
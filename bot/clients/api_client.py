@@ -1,10 +1,28 @@
-from typing import Optional
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 import httpx
 from loguru import logger
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
 
+from app.utils.tracing import inject_context, tracer
+from bot.clients.circuit_breaker import CircuitBreaker, CircuitOpen
 from bot.core.config import BotSettings
+from bot.core.metrics import API_CIRCUIT_OPEN, API_REQUEST_SECONDS, API_RETRIES_TOTAL
+
+RETRYABLE_STATUS_CODES = (502, 504)
+UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class QueryRejected(Exception):
+    def __init__(self, status_code: int, retry_after: int):
+        super().__init__(f"Query rejected with {status_code}, retry after {retry_after}s")
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class APIClient:
@@ -12,18 +30,98 @@ class APIClient:
         self.settings = settings
         self.base_url = settings.backend_api_url
         self.bot_token = settings.bot_token
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.api_timeout, connect=settings.api_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.api_max_connections,
+                max_keepalive_connections=settings.api_max_keepalive_connections,
+                keepalive_expiry=settings.api_keepalive_expiry,
+            ),
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.api_breaker_failure_threshold,
+            reset_timeout=settings.api_breaker_reset_timeout,
+        )
+        API_CIRCUIT_OPEN.set_function(lambda: self.breaker.state != "closed")
+    
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.settings.api_retry_max_backoff, self.settings.api_retry_backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        idempotent: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        with tracer.start_as_current_span(
+            f"api.{endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.method": method, "http.target": path},
+        ) as span:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **inject_context()}
+            response = await self._send(method, path, endpoint, idempotent, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+    
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        idempotent: bool,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        attempts = self.settings.api_retry_attempts
+        
+        for attempt in range(1, attempts + 1):
+            self.breaker.check()
+            started_at = time.perf_counter()
+            try:
+                response = await self.client.request(method, f"{self.base_url}{path}", **kwargs)
+            except httpx.TransportError as e:
+                API_REQUEST_SECONDS.labels(endpoint=endpoint, outcome="error").observe(
+                    time.perf_counter() - started_at
+                )
+                self.breaker.record_failure()
+                if attempt == attempts or not (idempotent or isinstance(e, UNSENT_REQUEST_ERRORS)):
+                    raise
+                logger.warning(f"{method} {endpoint} failed ({e!r}), retry {attempt}/{attempts - 1}")
+            else:
+                API_REQUEST_SECONDS.labels(endpoint=endpoint, outcome=f"{response.status_code // 100}xx").observe(
+                    time.perf_counter() - started_at
+                )
+                if response.status_code < 500 or response.status_code == 503:
+                    self.breaker.record_success()
+                    return response
+                
+                self.breaker.record_failure()
+                if attempt == attempts or not idempotent or response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                logger.warning(f"{method} {endpoint} returned {response.status_code}, retry {attempt}/{attempts - 1}")
+            
+            API_RETRIES_TOTAL.labels(endpoint=endpoint).inc()
+            trace.get_current_span().add_event("retry", {"attempt": attempt})
+            await asyncio.sleep(self._backoff(attempt))
     
     async def create_telegram_user(self, telegram_chat_id: int) -> Optional[UUID]:
         try:
-            response = await self.client.post(
-                f"{self.base_url}/auth/telegram/create",
+            response = await self._request(
+                "POST",
+                "/auth/telegram/create",
+                endpoint="create_telegram_user",
+                idempotent=True,
                 json={"telegram_chat_id": telegram_chat_id},
                 headers={"X-Bot-Token": self.bot_token},
             )
             response.raise_for_status()
             data = response.json()
             return UUID(data["id"])
+        except CircuitOpen as e:
+            logger.warning(f"Skipping user creation: {e}")
+            return None
         except httpx.HTTPStatusError as e:
             logger.error(f"API error creating user: {e.response.status_code} - {e.response.text}")
             return None
@@ -31,16 +129,67 @@ class APIClient:
             logger.exception(f"Error creating telegram user: {e}")
             return None
     
-    async def process_query(self, query: str) -> Optional[int]:
+    async def submit_query(
+        self,
+        query: str,
+        chat_id: Optional[int] = None,
+        reply: bool = False,
+    ) -> Dict[str, Any]:
+        headers = {"X-Bot-Token": self.bot_token}
+        payload: Dict[str, Any] = {"query": query}
+        if chat_id is not None:
+            headers["X-Telegram-Chat-Id"] = str(chat_id)
+            if reply:
+                payload["reply_chat_id"] = chat_id
+        
+        response = await self._request(
+            "POST",
+            "/query/jobs",
+            endpoint="submit_query",
+            json=payload,
+            headers=headers,
+        )
+        if response.status_code in (429, 503):
+            retry_after = response.headers.get("Retry-After", "1")
+            raise QueryRejected(response.status_code, int(retry_after) if retry_after.isdigit() else 1)
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_query_job(self, job_id: str, wait: float = 0) -> Dict[str, Any]:
+        response = await self._request(
+            "GET",
+            f"/query/jobs/{job_id}",
+            endpoint="get_query_job",
+            idempotent=True,
+            params={"wait": wait},
+            timeout=httpx.Timeout(self.settings.api_timeout + wait, connect=self.settings.api_connect_timeout),
+            headers={"X-Bot-Token": self.bot_token},
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def process_query(self, query: str, chat_id: Optional[int] = None) -> Optional[int]:
         try:
-            response = await self.client.post(
-                f"{self.base_url}/query/query",
-                json={"query": query},
-                headers={"X-Bot-Token": self.bot_token},
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("result")
+            job = await self.submit_query(query, chat_id)
+            job_id = job["job_id"]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.settings.query_timeout
+            
+            while True:
+                if job["status"] == "complete":
+                    return job.get("result")
+                if job["status"] == "failed":
+                    logger.error(f"Query job {job_id} failed: {job.get('error')}")
+                    return None
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.error(f"Query job {job_id} timed out")
+                    return None
+                
+                job = await self.get_query_job(job_id, wait=min(self.settings.query_poll_wait, remaining))
+        except (QueryRejected, CircuitOpen):
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"API error processing query: {e.response.status_code} - {e.response.text}")
             return None
@@ -48,6 +197,20 @@ class APIClient:
             logger.exception(f"Error processing query: {e}")
             return None
     
+    async def dispatch_query(self, query: str, chat_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            job = await self.submit_query(query, chat_id, reply=True)
+            logger.info(f"Query job {job['job_id']} submitted for push delivery to chat {chat_id}")
+            return job
+        except (QueryRejected, CircuitOpen):
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API error submitting query: {e.response.status_code} - {e.response.text}")
+            return None
+        except Exception as e:
+            logger.exception(f"Error submitting query: {e}")
+            return None
+    
     async def close(self):
         await self.client.aclose()
 
@@ -0,0 +1,56 @@
+import math
+import time
+from typing import Optional
+
+from loguru import logger
+
+
+class CircuitOpen(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit is open, retry after {math.ceil(retry_after)}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started_at: Optional[float] = None
+    
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+    
+    def check(self) -> None:
+        if self._opened_at is None:
+            return
+        
+        now = time.monotonic()
+        retry_after = self._opened_at + self.reset_timeout - now
+        if retry_after > 0:
+            raise CircuitOpen(retry_after)
+        
+        if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+            raise CircuitOpen(self._probe_started_at + self.reset_timeout - now)
+        self._probe_started_at = now
+    
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("API circuit closed")
+        self.failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_started_at = None
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"API circuit opened after {self.failures} consecutive failures")
+            self._opened_at = time.monotonic()
@@ -0,0 +1,123 @@
+import asyncio
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError, TelegramRetryAfter
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.services.query_delivery_service import QUERY_RESULTS_STREAM
+from app.utils.tracing import extract_context, tracer
+from bot.core.answer_cache import AnswerCache
+
+RESULT_CONSUMER_GROUP = "bot"
+QUERY_FAILED_MESSAGE = (
+    "Произошла ошибка при обработке запроса. "
+    "Попробуйте переформулировать запрос или повторить позже."
+)
+
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+
+class QueryResultConsumer:
+    def __init__(
+        self,
+        redis: Redis,
+        bot: Bot,
+        answer_cache: AnswerCache,
+        consumer_name: Optional[str] = None,
+        batch_size: int = 50,
+        block_ms: int = 5000,
+        claim_idle_ms: int = 60000,
+    ):
+        self.redis = redis
+        self.bot = bot
+        self.answer_cache = answer_cache
+        self.consumer_name = consumer_name or socket.gethostname()
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+    
+    async def run(self) -> None:
+        logger.info(f"Consuming query results from {QUERY_RESULTS_STREAM} as {self.consumer_name}")
+        while True:
+            try:
+                await self._ensure_group()
+                await self._process(await self._claim_stale())
+                while pending := await self._read("0"):
+                    await self._process(pending)
+                while True:
+                    await self._process(await self._read(">"))
+            except asyncio.CancelledError:
+                raise
+            except TelegramRetryAfter as e:
+                logger.warning(f"Telegram flood control, retrying delivery in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.exception(f"Query result consumer error: {e}")
+                await asyncio.sleep(1)
+    
+    async def _ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(QUERY_RESULTS_STREAM, RESULT_CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+    
+    async def _claim_stale(self) -> List[StreamEntry]:
+        _, entries, *_ = await self.redis.xautoclaim(
+            QUERY_RESULTS_STREAM,
+            RESULT_CONSUMER_GROUP,
+            self.consumer_name,
+            min_idle_time=self.claim_idle_ms,
+            count=self.batch_size,
+        )
+        return entries
+    
+    async def _read(self, stream_id: str) -> List[StreamEntry]:
+        response = await self.redis.xreadgroup(
+            RESULT_CONSUMER_GROUP,
+            self.consumer_name,
+            {QUERY_RESULTS_STREAM: stream_id},
+            count=self.batch_size,
+            block=self.block_ms if stream_id == ">" else None,
+        )
+        return response[0][1] if response else []
+    
+    async def _process(self, entries: List[StreamEntry]) -> None:
+        for entry_id, fields in entries:
+            if fields:
+                decoded = {key.decode(): value.decode() for key, value in fields.items()}
+                with tracer.start_as_current_span(
+                    "bot.deliver_result",
+                    context=extract_context(decoded),
+                    attributes={"job.id": decoded["job_id"]},
+                ):
+                    await self._deliver(decoded)
+            await self.redis.xack(QUERY_RESULTS_STREAM, RESULT_CONSUMER_GROUP, entry_id)
+    
+    async def _deliver(self, fields: Dict[str, str]) -> None:
+        chat_id = int(fields["chat_id"])
+        
+        if fields["status"] == "complete":
+            text = fields["result"]
+            await self.answer_cache.set(fields["query"], int(fields["result"]))
+            logger.info(f"Delivering result of job {fields['job_id']} to chat {chat_id}: {text}")
+        else:
+            text = QUERY_FAILED_MESSAGE
+            logger.error(f"Query job {fields['job_id']} for chat {chat_id} failed: {fields.get('error')}")
+        
+        await self._send(chat_id, text, fields["job_id"])
+        for waiter in await self.answer_cache.release_pending(fields["query"]):
+            if waiter != chat_id:
+                await self._send(waiter, text, fields["job_id"])
+    
+    async def _send(self, chat_id: int, text: str, job_id: str) -> None:
+        try:
+            await self.bot.send_message(chat_id, text)
+        except (TelegramNetworkError, TelegramRetryAfter):
+            raise
+        except TelegramAPIError as e:
+            logger.warning(f"Could not deliver result of job {job_id} to chat {chat_id}: {e}")
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from app.services.data_generation_service import get_data_generation
+from app.utils.cache import TTLCache
+from app.utils.text import normalize_question
+
+PENDING_CLAIM_PREFIX = "bot:pending:claim:"
+PENDING_WAITERS_PREFIX = "bot:pending:waiters:"
+
+JOIN_PENDING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+    redis.call('PEXPIRE', KEYS[2], ARGV[2])
+    return 1
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return 0
+"""
+
+RELEASE_PENDING_SCRIPT = """
+local waiters = redis.call('SMEMBERS', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return waiters
+"""
+
+class AnswerCache:
+    def __init__(self, redis: Redis, ttl: float, size: int, pending_ttl: float = 120.0):
+        self.redis = redis
+        self.cache = TTLCache(max_size=size, ttl=ttl)
+        self.pending_ttl = pending_ttl
+        self.generation = 0
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._join_pending = redis.register_script(JOIN_PENDING_SCRIPT)
+        self._release_pending = redis.register_script(RELEASE_PENDING_SCRIPT)
+    
+    async def current_generation(self) -> int:
+        try:
+            generation = await get_data_generation(self.redis)
+        except Exception as e:
+            logger.warning(f"Could not read data generation: {e}")
+            return self.generation
+        
+        if generation != self.generation:
+            if self.cache:
+                logger.info(f"Data generation changed to {generation}, dropping {len(self.cache)} cached answers")
+            self.cache.clear()
+            self.generation = generation
+        return generation
+    
+    async def get(self, question: str) -> Optional[int]:
+        key = normalize_question(question)
+        await self.current_generation()
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Answer cache hit for: {key[:100]}")
+        return cached
+    
+    async def set(self, question: str, result: Optional[int]) -> None:
+        if result is not None:
+            self.cache.set(normalize_question(question), result)
+    
+    async def get_or_load(
+        self,
+        question: str,
+        load: Callable[[], Awaitable[Optional[int]]],
+    ) -> Optional[int]:
+        key = normalize_question(question)
+        generation = await self.current_generation()
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Answer cache hit for: {key[:100]}")
+            return cached
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, generation, load))
+            self._in_flight[key] = task
+        else:
+            logger.info(f"Joining in-flight query for: {key[:100]}")
+        
+        return await asyncio.shield(task)
+    
+    async def _load(
+        self,
+        key: str,
+        generation: int,
+        load: Callable[[], Awaitable[Optional[int]]],
+    ) -> Optional[int]:
+        try:
+            result = await load()
+        finally:
+            self._in_flight.pop(key, None)
+        
+        if result is not None and generation == self.generation:
+            self.cache.set(key, result)
+        return result
+    
+    def _pending_keys(self, question: str) -> List[str]:
+        digest = hashlib.sha1(normalize_question(question).encode()).hexdigest()
+        return [PENDING_CLAIM_PREFIX + digest, PENDING_WAITERS_PREFIX + digest]
+    
+    async def join_pending(self, question: str, chat_id: int) -> bool:
+        try:
+            joined = await self._join_pending(
+                keys=self._pending_keys(question),
+                args=[chat_id, int(self.pending_ttl * 1000)],
+            )
+        except Exception as e:
+            logger.warning(f"Could not check in-flight queries: {e}")
+            return False
+        
+        if joined:
+            logger.info(f"Chat {chat_id} joined in-flight query for: {normalize_question(question)[:100]}")
+        return bool(joined)
+    
+    async def release_pending(self, question: str) -> List[int]:
+        try:
+            waiters = await self._release_pending(keys=self._pending_keys(question))
+        except Exception as e:
+            logger.warning(f"Could not release in-flight query: {e}")
+            return []
+        return [int(chat_id) for chat_id in waiters]
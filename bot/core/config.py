@@ -1,12 +1,60 @@
+from enum import Enum
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 from app.core.config import BaseConfig
 
 
+class BotMode(str, Enum):
+    POLLING = "polling"
+    WEBHOOK = "webhook"
+
+
+class QueryDelivery(str, Enum):
+    POLL = "poll"
+    PUSH = "push"
+
+
 class BotSettings(BaseSettings):
     bot_token: str = Field(..., alias="TELEGRAM_BOT_TOKEN")
     backend_api_url: str = Field(..., alias="BACKEND_API_URL")
+    query_poll_wait: float = Field(default=25.0, gt=0, le=60, alias="QUERY_POLL_WAIT")
+    query_timeout: float = Field(default=120.0, gt=0, alias="QUERY_TIMEOUT")
+    query_delivery: QueryDelivery = Field(default=QueryDelivery.POLL, alias="BOT_QUERY_DELIVERY")
+    max_concurrent_queries: int = Field(default=8, ge=1, alias="BOT_MAX_CONCURRENT_QUERIES")
+    max_queued_queries: int = Field(default=100, ge=0, alias="BOT_MAX_QUEUED_QUERIES")
+    
+    api_timeout: float = Field(default=30.0, gt=0, alias="API_TIMEOUT")
+    api_connect_timeout: float = Field(default=5.0, gt=0, alias="API_CONNECT_TIMEOUT")
+    api_max_connections: int = Field(default=50, ge=1, alias="API_MAX_CONNECTIONS")
+    api_max_keepalive_connections: int = Field(default=20, ge=0, alias="API_MAX_KEEPALIVE_CONNECTIONS")
+    api_keepalive_expiry: float = Field(default=30.0, ge=0, alias="API_KEEPALIVE_EXPIRY")
+    api_retry_attempts: int = Field(default=3, ge=1, alias="API_RETRY_ATTEMPTS")
+    api_retry_backoff: float = Field(default=0.2, ge=0, alias="API_RETRY_BACKOFF")
+    api_retry_max_backoff: float = Field(default=2.0, ge=0, alias="API_RETRY_MAX_BACKOFF")
+    api_breaker_failure_threshold: int = Field(default=5, ge=1, alias="API_BREAKER_FAILURE_THRESHOLD")
+    api_breaker_reset_timeout: float = Field(default=30.0, gt=0, alias="API_BREAKER_RESET_TIMEOUT")
+    metrics_port: int = Field(default=9192, ge=1, le=65535, alias="BOT_METRICS_PORT")
+    
+    bot_mode: BotMode = Field(default=BotMode.POLLING, alias="BOT_MODE")
+    webhook_base_url: Optional[str] = Field(default=None, alias="WEBHOOK_BASE_URL")
+    webhook_path: str = Field(default="/telegram/webhook", alias="WEBHOOK_PATH")
+    webhook_secret: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=256,
+        pattern=r"^[A-Za-z0-9_-]+$",
+        alias="WEBHOOK_SECRET",
+    )
+    webhook_host: str = Field(default="0.0.0.0", alias="WEBHOOK_HOST")
+    webhook_port: int = Field(default=8080, ge=1, le=65535, alias="WEBHOOK_PORT")
+    
+    redis_host: str = Field(default="localhost", alias="REDIS_HOST")
+    redis_port: int = Field(default=6379, ge=1, le=65535, alias="REDIS_PORT")
+    update_dedup_ttl: int = Field(default=3600, ge=1, alias="BOT_UPDATE_DEDUP_TTL")
+    answer_cache_ttl: float = Field(default=300.0, ge=0, alias="BOT_ANSWER_CACHE_TTL")
+    answer_cache_size: int = Field(default=1000, ge=1, alias="BOT_ANSWER_CACHE_SIZE")
     
     model_config = BaseConfig.model_config
-
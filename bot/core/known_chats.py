@@ -0,0 +1,42 @@
+from typing import Set
+
+from loguru import logger
+from redis.asyncio import Redis
+
+KNOWN_CHATS_KEY = "bot:known_chats"
+
+
+class KnownChats:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.chats: Set[int] = set()
+    
+    async def warm(self) -> None:
+        try:
+            async for chat_id in self.redis.sscan_iter(KNOWN_CHATS_KEY, count=1000):
+                self.chats.add(int(chat_id))
+        except Exception as e:
+            logger.warning(f"Could not warm known chats: {e}")
+            return
+        logger.info(f"Loaded {len(self.chats)} known chats")
+    
+    async def contains(self, chat_id: int) -> bool:
+        if chat_id in self.chats:
+            return True
+        
+        try:
+            known = await self.redis.sismember(KNOWN_CHATS_KEY, chat_id)
+        except Exception as e:
+            logger.warning(f"Could not check known chat {chat_id}: {e}")
+            return False
+        
+        if known:
+            self.chats.add(chat_id)
+        return bool(known)
+    
+    async def add(self, chat_id: int) -> None:
+        self.chats.add(chat_id)
+        try:
+            await self.redis.sadd(KNOWN_CHATS_KEY, chat_id)
+        except Exception as e:
+            logger.warning(f"Could not persist known chat {chat_id}: {e}")
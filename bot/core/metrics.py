@@ -0,0 +1,21 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+API_REQUEST_SECONDS = Histogram(
+    "bot_api_request_seconds",
+    "Latency of a single HTTP call from the bot to the backend API",
+    ["endpoint", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+API_RETRIES_TOTAL = Counter(
+    "bot_api_retries_total",
+    "Retried bot to API calls",
+    ["endpoint"],
+)
+API_CIRCUIT_OPEN = Gauge(
+    "bot_api_circuit_open",
+    "Whether the circuit breaker in front of the backend API is open",
+)
+QUERIES_PENDING = Gauge(
+    "bot_queries_pending",
+    "Queries accepted by the bot that are queued or running",
+)
@@ -1,9 +1,20 @@
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
 from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.types import Message, TelegramObject, Update
+from aiogram.utils.chat_action import ChatActionSender
+from loguru import logger
+from redis.asyncio import Redis
 
 from bot.clients.api_client import APIClient
+from bot.core.answer_cache import AnswerCache
+from bot.core.known_chats import KnownChats
+from bot.core.metrics import QUERIES_PENDING
+
+UPDATE_KEY_PREFIX = "bot:update:"
 
 
 class APIClientMiddleware(BaseMiddleware):
@@ -19,3 +30,110 @@ class APIClientMiddleware(BaseMiddleware):
         data["api_client"] = self.api_client
         return await handler(event, data)
 
+
+class AnswerCacheMiddleware(BaseMiddleware):
+    def __init__(self, answer_cache: AnswerCache):
+        self.answer_cache = answer_cache
+    
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        data["answer_cache"] = self.answer_cache
+        return await handler(event, data)
+
+
+class KnownChatsMiddleware(BaseMiddleware):
+    def __init__(self, known_chats: KnownChats):
+        self.known_chats = known_chats
+    
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        data["known_chats"] = self.known_chats
+        return await handler(event, data)
+
+
+@dataclass
+class ChatQueue:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    pending: int = 0
+    actions: AsyncExitStack = field(default_factory=AsyncExitStack)
+
+
+class QueryConcurrencyMiddleware(BaseMiddleware):
+    def __init__(self, max_concurrency: int, max_queued: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_pending = max_concurrency + max_queued
+        self.pending = 0
+        self.chats: Dict[int, ChatQueue] = {}
+    
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, Message):
+            return await handler(event, data)
+        
+        chat_id = event.chat.id
+        if self.pending >= self.max_pending:
+            logger.warning(f"Dropping query from chat {chat_id}: {self.pending} queries pending")
+            await event.answer("Бот сейчас перегружен. Попробуйте повторить запрос позже.")
+            return None
+        
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            chat = self.chats[chat_id] = ChatQueue()
+        
+        self.pending += 1
+        chat.pending += 1
+        QUERIES_PENDING.inc()
+        try:
+            if chat.pending == 1:
+                await chat.actions.enter_async_context(
+                    ChatActionSender.typing(chat_id=chat_id, bot=data["bot"])
+                )
+            async with chat.lock:
+                async with self.semaphore:
+                    return await handler(event, data)
+        finally:
+            self.pending -= 1
+            chat.pending -= 1
+            QUERIES_PENDING.dec()
+            if chat.pending == 0:
+                del self.chats[chat_id]
+                await chat.actions.aclose()
+
+
+class UpdateDeduplicationMiddleware(BaseMiddleware):
+    def __init__(self, redis: Redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+    
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if isinstance(event, Update):
+            try:
+                is_new = await self.redis.set(
+                    f"{UPDATE_KEY_PREFIX}{event.update_id}", 1, nx=True, ex=self.ttl
+                )
+            except Exception as e:
+                logger.warning(f"Update deduplication unavailable: {e}")
+                is_new = True
+            
+            if not is_new:
+                logger.info(f"Skipping duplicate update {event.update_id}")
+                return None
+        
+        return await handler(event, data)
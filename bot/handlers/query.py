@@ -1,14 +1,32 @@
+from datetime import datetime, timezone
+
 from aiogram import Router, F
 from aiogram.types import Message
 from loguru import logger
 
-from bot.clients.api_client import APIClient
+from app.utils.tracing import tracer
+from bot.clients.api_client import APIClient, QueryRejected
+from bot.clients.circuit_breaker import CircuitOpen
+from bot.clients.result_consumer import QUERY_FAILED_MESSAGE
+from bot.core.answer_cache import AnswerCache
+from bot.core.config import QueryDelivery
 
 router = Router()
 
 
 @router.message(F.text & ~F.text.startswith("/"))
-async def handle_query(message: Message, api_client: APIClient):
+async def handle_query(message: Message, api_client: APIClient, answer_cache: AnswerCache):
+    with tracer.start_as_current_span(
+        "bot.handle_query",
+        attributes={
+            "telegram.chat_id": message.chat.id,
+            "telegram.message_age_seconds": (datetime.now(timezone.utc) - message.date).total_seconds(),
+        },
+    ):
+        await _answer_query(message, api_client, answer_cache)
+
+
+async def _answer_query(message: Message, api_client: APIClient, answer_cache: AnswerCache):
     chat_id = message.chat.id
     user_query = message.text
     
@@ -18,15 +36,56 @@ async def handle_query(message: Message, api_client: APIClient):
     
     logger.info(f"User {chat_id} sent query: {user_query[:100]}...")
     
-    result = await api_client.process_query(user_query)
+    try:
+        if api_client.settings.query_delivery == QueryDelivery.PUSH:
+            result = await answer_cache.get(user_query)
+            if result is None:
+                if await answer_cache.join_pending(user_query, chat_id):
+                    return
+                try:
+                    job = await api_client.dispatch_query(user_query, chat_id)
+                except (QueryRejected, CircuitOpen):
+                    await _answer_waiters(message, answer_cache, user_query, QUERY_FAILED_MESSAGE)
+                    raise
+                if job is not None and job["status"] in ("queued", "in_progress"):
+                    return
+                result = job.get("result") if job else None
+                await answer_cache.set(user_query, result)
+                await _answer_waiters(
+                    message,
+                    answer_cache,
+                    user_query,
+                    f"{result}" if result is not None else QUERY_FAILED_MESSAGE,
+                )
+        else:
+            result = await answer_cache.get_or_load(
+                user_query,
+                lambda: api_client.process_query(user_query, chat_id=chat_id),
+            )
+    except QueryRejected as e:
+        await message.answer(
+            f"Слишком много запросов. Попробуйте повторить через {e.retry_after} сек."
+        )
+        logger.warning(f"Query from user {chat_id} rejected: {e}")
+        return
+    except CircuitOpen as e:
+        await message.answer("Сервис временно недоступен. Попробуйте повторить позже.")
+        logger.warning(f"Query from user {chat_id} not sent: {e}")
+        return
     
     if result is not None:
         await message.answer(f"{result}")
         logger.info(f"Query processed successfully for user {chat_id}, result: {result}")
     else:
-        await message.answer(
-            "Произошла ошибка при обработке запроса. "
-            "Попробуйте переформулировать запрос или повторить позже."
-        )
+        await message.answer(QUERY_FAILED_MESSAGE)
         logger.error(f"Failed to process query for user {chat_id}")
 
+
+async def _answer_waiters(message: Message, answer_cache: AnswerCache, user_query: str, text: str):
+    for waiter in await answer_cache.release_pending(user_query):
+        if waiter == message.chat.id:
+            continue
+        try:
+            await message.bot.send_message(waiter, text)
+        except Exception as e:
+            logger.warning(f"Could not answer chat {waiter} waiting for the same query: {e}")
@@ -5,19 +5,26 @@ from loguru import logger
 
 from bot.clients.api_client import APIClient
 from bot.core.config import BotSettings
+from bot.core.known_chats import KnownChats
 
 router = Router()
 
 
 @router.message(CommandStart())
-async def cmd_start(message: Message, api_client: APIClient):
+async def cmd_start(message: Message, api_client: APIClient, known_chats: KnownChats):
     chat_id = message.chat.id
     
     logger.info(f"User {chat_id} started the bot")
     
+    if await known_chats.contains(chat_id):
+        await message.answer("Привет! Вы успешно авторизованы.")
+        logger.info(f"User {chat_id} is already registered")
+        return
+    
     user_id = await api_client.create_telegram_user(telegram_chat_id=chat_id)
     
     if user_id:
+        await known_chats.add(chat_id)
         await message.answer(
             f"Привет! Вы успешно авторизованы."
         )
@@ -1,15 +1,30 @@
 import asyncio
 import sys
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 from loguru import logger
+from prometheus_client import start_http_server
+from redis.asyncio import Redis
 
+from app.utils.tracing import setup_tracing, shutdown_tracing
 from bot.clients.api_client import APIClient
-from bot.core.config import BotSettings
-from bot.core.middleware import APIClientMiddleware
+from bot.clients.result_consumer import QueryResultConsumer
+from bot.core.answer_cache import AnswerCache
+from bot.core.config import BotMode, BotSettings, QueryDelivery
+from bot.core.known_chats import KnownChats
+from bot.core.middleware import (
+    AnswerCacheMiddleware,
+    APIClientMiddleware,
+    KnownChatsMiddleware,
+    QueryConcurrencyMiddleware,
+    UpdateDeduplicationMiddleware,
+)
 from bot.handlers import start, query
 
 
@@ -23,17 +38,73 @@ async def setup_logging():
 
 
 @asynccontextmanager
-async def lifespan(bot: Bot, api_client: APIClient):
+async def lifespan(
+    bot: Bot,
+    api_client: APIClient,
+    redis: Redis,
+    result_consumer: Optional[QueryResultConsumer] = None,
+):
     logger.info("Bot starting...")
+    consumer_task = asyncio.create_task(result_consumer.run()) if result_consumer else None
     yield
     logger.info("Bot shutting down...")
+    if consumer_task is not None:
+        consumer_task.cancel()
+        await asyncio.gather(consumer_task, return_exceptions=True)
     await api_client.close()
+    await redis.aclose()
+    shutdown_tracing()
+
+
+async def health_check(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def run_polling(bot: Bot, dp: Dispatcher):
+    await bot.delete_webhook()
+    logger.info("Bot is running in polling mode...")
+    await dp.start_polling(bot)
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, settings: BotSettings):
+    if not settings.webhook_base_url or not settings.webhook_secret:
+        raise ValueError("WEBHOOK_BASE_URL and WEBHOOK_SECRET are required in webhook mode")
+    
+    app = web.Application()
+    app.router.add_get("/health", health_check)
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.webhook_secret,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    
+    webhook_url = f"{settings.webhook_base_url.rstrip('/')}{settings.webhook_path}"
+    await bot.set_webhook(
+        webhook_url,
+        secret_token=settings.webhook_secret,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    logger.info(f"Bot is running in webhook mode on {settings.webhook_host}:{settings.webhook_port}")
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
 
 
 async def main():
     await setup_logging()
     
     settings = BotSettings()
+    start_http_server(settings.metrics_port)
+    logger.info(f"Bot metrics exposed on port {settings.metrics_port}")
+    setup_tracing("bot")
     
     bot = Bot(
         token=settings.bot_token,
@@ -41,15 +112,36 @@ async def main():
     )
     
     api_client = APIClient(settings)
+    redis = Redis(host=settings.redis_host, port=settings.redis_port)
+    answer_cache = AnswerCache(
+        redis,
+        settings.answer_cache_ttl,
+        settings.answer_cache_size,
+        pending_ttl=settings.query_timeout,
+    )
+    known_chats = KnownChats(redis)
+    await known_chats.warm()
     
     dp = Dispatcher()
+    dp.update.outer_middleware(UpdateDeduplicationMiddleware(redis, settings.update_dedup_ttl))
     dp.message.middleware(APIClientMiddleware(api_client))
+    dp.message.middleware(AnswerCacheMiddleware(answer_cache))
+    dp.message.middleware(KnownChatsMiddleware(known_chats))
+    query.router.message.middleware(
+        QueryConcurrencyMiddleware(settings.max_concurrent_queries, settings.max_queued_queries)
+    )
     dp.include_router(start.router)
     dp.include_router(query.router)
     
-    async with lifespan(bot, api_client):
-        logger.info("Bot is running...")
-        await dp.start_polling(bot)
+    result_consumer = None
+    if settings.query_delivery == QueryDelivery.PUSH:
+        result_consumer = QueryResultConsumer(redis, bot, answer_cache)
+    
+    async with lifespan(bot, api_client, redis, result_consumer):
+        if settings.bot_mode == BotMode.WEBHOOK:
+            await run_webhook(bot, dp, settings)
+        else:
+            await run_polling(bot, dp)
 
 
 if __name__ == "__main__":
@@ -61,4 +153,3 @@ if __name__ == "__main__":
     except Exception as e:
         logger.exception(f"Fatal error: {e}")
         sys.exit(1)
-
@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+from sqlalchemy import func, select, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.database import get_async_sessionmaker
+from app.models.videos import Video
+from app.services.data_loader_service import DataLoaderService
+from app.services.query_service import QueryService
+from generate_dataset import DEFAULT_START, generate_dataset
+
+DEFAULT_SIZES = [10 ** 5, 10 ** 6, 10 ** 7]
+
+
+def build_query_catalogue(creator_id: str, start: datetime) -> Dict[str, Dict[str, Any]]:
+    day = (start + timedelta(days=3)).strftime('%Y-%m-%d')
+    week_end = (start + timedelta(days=9)).strftime('%Y-%m-%d')
+    return {
+        'count_videos': {
+            'query_type': 'count',
+            'table': 'videos',
+        },
+        'count_creator_videos_in_range': {
+            'query_type': 'count',
+            'table': 'videos',
+            'date_field': 'video_created_at',
+            'filters': {'creator_id': creator_id, 'date_from': day, 'date_to': week_end},
+        },
+        'count_videos_views_gt': {
+            'query_type': 'count',
+            'table': 'videos',
+            'filters': {'metric_gt': {'field': 'views_count', 'value': 100000}},
+        },
+        'sum_delta_views_on_day': {
+            'query_type': 'sum',
+            'table': 'video_snapshots',
+            'field': 'delta_views_count',
+            'date_field': 'created_at',
+            'filters': {'date': day},
+        },
+        'sum_creator_delta_views_in_window': {
+            'query_type': 'sum',
+            'table': 'video_snapshots',
+            'field': 'delta_views_count',
+            'date_field': 'created_at',
+            'filters': {'creator_id': creator_id, 'date': day, 'time_from': '10:00', 'time_to': '15:00'},
+        },
+        'distinct_videos_with_growth_on_day': {
+            'query_type': 'distinct_count',
+            'table': 'video_snapshots',
+            'field': 'video_id',
+            'date_field': 'created_at',
+            'filters': {'date': day, 'delta_views_count_gt': 0},
+        },
+        'distinct_creators': {
+            'query_type': 'distinct_count',
+            'table': 'videos',
+            'field': 'creator_id',
+        },
+    }
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent.parent,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def reset_tables(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        await session.execute(text("TRUNCATE videos, video_snapshots, load_checkpoints"))
+        await session.commit()
+
+
+async def tables_are_empty(sessionmaker) -> bool:
+    async with sessionmaker() as session:
+        result = await session.execute(select(func.count()).select_from(Video))
+        return result.scalar_one() == 0
+
+
+async def top_creator_id(sessionmaker) -> str:
+    async with sessionmaker() as session:
+        result = await session.execute(
+            select(Video.creator_id)
+            .group_by(Video.creator_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        return result.scalar_one()
+
+
+async def run_load(sessionmaker, dataset_path: Path, batch_size: int, bulk: bool) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    async with sessionmaker() as session:
+        loader = DataLoaderService(session, batch_size=batch_size)
+        result = await loader.load_from_json_file(str(dataset_path), stream=True, bulk=bulk)
+        await session.execute(text("ANALYZE videos"))
+        await session.execute(text("ANALYZE video_snapshots"))
+        await session.commit()
+    elapsed = time.perf_counter() - started_at
+
+    rows = result['videos'] + result['snapshots']
+    return {
+        'seconds': round(elapsed, 3),
+        'videos': result['videos'],
+        'snapshots': result['snapshots'],
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else None,
+    }
+
+
+async def run_queries(sessionmaker, catalogue: Dict[str, Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    async with sessionmaker() as session:
+        query_service = QueryService(session)
+        for name, plan in catalogue.items():
+            timings = []
+            value = None
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                value = await query_service.execute_query(copy.deepcopy(plan))
+                timings.append((time.perf_counter() - started_at) * 1000)
+
+            results.append({
+                'name': name,
+                'result': value,
+                'median_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(percentile(timings, 0.95), 3),
+                'min_ms': round(min(timings), 3),
+            })
+            logger.info(f"{name}: median {statistics.median(timings):.2f} ms")
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark data loading and query execution on synthetic data")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Dataset sizes in snapshots",
+    )
+    parser.add_argument("--hours", type=int, default=100, help="Hourly snapshots per video")
+    parser.add_argument("--creators", type=int, default=1000, help="Number of creators")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Loader batch size")
+    parser.add_argument("--bulk", action="store_true", help="Use the COPY loading path")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per catalogue query")
+    parser.add_argument("--data-dir", default="data/synthetic", help="Where generated dumps are cached")
+    parser.add_argument("--output-dir", default="bench_results", help="Where result files are written")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Allow truncating videos, video_snapshots and load_checkpoints before each size",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    sessionmaker = get_async_sessionmaker()
+
+    if not args.truncate and not await tables_are_empty(sessionmaker):
+        logger.error("Database is not empty. Run against a dedicated database and pass --truncate")
+        sys.exit(1)
+
+    report = {
+        'commit': current_commit(),
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'params': vars(args),
+        'runs': [],
+    }
+
+    for size in args.sizes:
+        videos = max(1, size // args.hours)
+        dataset_path = Path(args.data_dir) / f"videos-{videos}x{args.hours}-c{args.creators}-s{args.seed}.json"
+
+        if dataset_path.exists():
+            logger.info(f"Reusing dataset {dataset_path}")
+        else:
+            logger.info(f"Generating dataset {dataset_path}")
+            generate_dataset(dataset_path, videos=videos, creators=args.creators, hours=args.hours, seed=args.seed)
+
+        await reset_tables(sessionmaker)
+
+        logger.info(f"Loading {videos * args.hours} snapshots")
+        load = await run_load(sessionmaker, dataset_path, args.batch_size, args.bulk)
+        logger.info(f"Loaded in {load['seconds']}s ({load['rows_per_second']} rows/s)")
+
+        catalogue = build_query_catalogue(await top_creator_id(sessionmaker), DEFAULT_START)
+        queries = await run_queries(sessionmaker, catalogue, args.repeat)
+
+        report['runs'].append({
+            'snapshots': videos * args.hours,
+            'videos': videos,
+            'load': load,
+            'queries': queries,
+        })
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    output_path = output_dir / f"benchmark-{report['commit']}-{timestamp}.json"
+    output_path.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+    logger.success(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+import argparse
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+DEFAULT_START = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _build_video(
+    rng: random.Random,
+    creator_id: str,
+    created_at: datetime,
+    popularity: float,
+    hours: int,
+) -> Dict[str, Any]:
+    video_id = str(_uuid(rng))
+    like_rate = rng.uniform(0.01, 0.08)
+    comment_rate = rng.uniform(0.001, 0.01)
+    report_rate = rng.uniform(0.0, 0.0005)
+
+    views = likes = comments = reports = 0
+    snapshots: List[Dict[str, Any]] = []
+
+    for hour in range(1, hours + 1):
+        expected_views = popularity * 1000 / hour ** 0.8
+        delta_views = max(0, int(rng.gauss(expected_views, expected_views * 0.3)))
+        delta_likes = int(delta_views * like_rate * rng.uniform(0.5, 1.5))
+        delta_comments = int(delta_views * comment_rate * rng.uniform(0.5, 1.5))
+        delta_reports = 1 if rng.random() < delta_views * report_rate else 0
+
+        views += delta_views
+        likes += delta_likes
+        comments += delta_comments
+        reports += delta_reports
+
+        snapshot_time = (created_at + timedelta(hours=hour)).isoformat()
+        snapshots.append({
+            'id': _uuid(rng).hex,
+            'video_id': video_id,
+            'views_count': views,
+            'likes_count': likes,
+            'comments_count': comments,
+            'reports_count': reports,
+            'delta_views_count': delta_views,
+            'delta_likes_count': delta_likes,
+            'delta_comments_count': delta_comments,
+            'delta_reports_count': delta_reports,
+            'created_at': snapshot_time,
+            'updated_at': snapshot_time,
+        })
+
+    updated_at = (created_at + timedelta(hours=hours)).isoformat()
+    return {
+        'id': video_id,
+        'creator_id': creator_id,
+        'video_created_at': created_at.isoformat(),
+        'views_count': views,
+        'likes_count': likes,
+        'comments_count': comments,
+        'reports_count': reports,
+        'created_at': created_at.isoformat(),
+        'updated_at': updated_at,
+        'snapshots': snapshots,
+    }
+
+
+def generate_dataset(
+    output_path: Path,
+    videos: int,
+    creators: int,
+    hours: int,
+    days: int = 30,
+    skew: float = 1.2,
+    seed: int = 42,
+    start: datetime = DEFAULT_START,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    creator_ids = [_uuid(rng).hex for _ in range(creators)]
+    creator_weights = [1 / rank ** skew for rank in range(1, creators + 1)]
+    window_seconds = days * 24 * 3600
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('{"videos": [')
+        for index in range(videos):
+            creator_id = rng.choices(creator_ids, weights=creator_weights)[0]
+            created_at = start + timedelta(seconds=rng.randrange(window_seconds))
+            popularity = rng.paretovariate(skew)
+            video = _build_video(rng, creator_id, created_at, popularity, hours)
+
+            if index:
+                f.write(',')
+            f.write(json.dumps(video, separators=(',', ':')))
+
+            if (index + 1) % 10000 == 0:
+                logger.info(f"Generated {index + 1}/{videos} videos")
+        f.write(']}')
+
+    return {
+        'videos': videos,
+        'snapshots': videos * hours,
+        'creators': creators,
+        'top_creator_id': creator_ids[0],
+        'start': start.isoformat(),
+        'days': days,
+        'seed': seed,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic videos.json dump")
+    parser.add_argument("output_path", help="Where to write the JSON file")
+    parser.add_argument("--videos", type=int, default=1000, help="Number of videos")
+    parser.add_argument("--creators", type=int, default=100, help="Number of creators")
+    parser.add_argument("--hours", type=int, default=24, help="Hourly snapshots per video")
+    parser.add_argument("--days", type=int, default=30, help="Publication window in days")
+    parser.add_argument("--skew", type=float, default=1.2, help="Popularity skew (Pareto/Zipf exponent)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.videos < 1 or args.creators < 1 or args.hours < 0 or args.days < 1:
+        logger.error("--videos, --creators and --days must be positive, --hours must not be negative")
+        sys.exit(1)
+
+    summary = generate_dataset(
+        Path(args.output_path),
+        videos=args.videos,
+        creators=args.creators,
+        hours=args.hours,
+        days=args.days,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    logger.success(
+        f"Dataset written to {args.output_path}\n"
+        f"  Videos: {summary['videos']}\n"
+        f"  Snapshots: {summary['snapshots']}\n"
+        f"  Creators: {summary['creators']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import argparse
 import asyncio
+import os
 import sys
+import time
 from pathlib import Path
 
 from loguru import logger
@@ -7,15 +10,52 @@ from loguru import logger
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.db.database import get_async_sessionmaker
+from app.services.data_generation_service import notify_data_changed
 from app.services.data_loader_service import DataLoaderService
+from app.services.parallel_loader_service import ParallelLoaderService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load videos and snapshots from a JSON dump")
+    parser.add_argument("json_file_path", help="Path to the JSON file")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse videos incrementally instead of loading the whole file into memory",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Write batches with COPY into staging tables and merge them in one statement",
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="Videos per committed batch")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Transform batches in a process pool and write them over several connections",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Transform processes for --parallel",
+    )
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent DB writers for --parallel")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Upsert video totals, append unseen snapshots and resume from the file checkpoint",
+    )
+    args = parser.parse_args()
+    if args.incremental and args.parallel:
+        parser.error("--incremental cannot be combined with --parallel")
+    return args
 
 
 async def main():
-    if len(sys.argv) < 2:
-        logger.error("Usage: python scripts/load_data.py <path_to_json_file>")
-        sys.exit(1)
+    args = parse_args()
     
-    json_file_path = sys.argv[1]
+    json_file_path = args.json_file_path
     
     if not Path(json_file_path).exists():
         logger.error(f"File not found: {json_file_path}")
@@ -25,16 +65,36 @@ async def main():
     
     try:
         sessionmaker = get_async_sessionmaker()
+        started_at = time.perf_counter()
         
-        async with sessionmaker() as session:
-            loader = DataLoaderService(session)
-            result = await loader.load_from_json_file(json_file_path)
-            
-            logger.success(
-                f"Data loading completed successfully!\n"
-                f"  Videos loaded: {result['videos']}\n"
-                f"  Snapshots loaded: {result['snapshots']}"
+        if args.parallel:
+            loader = ParallelLoaderService(
+                sessionmaker,
+                workers=args.workers,
+                writers=args.writers,
+                batch_size=args.batch_size,
+                bulk=args.bulk,
             )
+            result = await loader.load_from_json_file(json_file_path, stream=args.stream)
+        else:
+            async with sessionmaker() as session:
+                loader = DataLoaderService(session, batch_size=args.batch_size)
+                result = await loader.load_from_json_file(
+                    json_file_path,
+                    stream=args.stream,
+                    bulk=args.bulk,
+                    incremental=args.incremental,
+                )
+            
+        elapsed = time.perf_counter() - started_at
+        rows = result['videos'] + result['snapshots']
+        logger.success(
+            f"Data loading completed successfully!\n"
+            f"  Videos loaded: {result['videos']}\n"
+            f"  Snapshots loaded: {result['snapshots']}\n"
+            f"  Elapsed: {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+        await notify_data_changed()
             
     except Exception as e:
         logger.exception(f"Error loading data: {e}")
@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import QueryExecutionMode
+from app.db.redis import create_arq_pool
+from app.services.query_executor import QueryExecutor
+from benchmark import current_commit, percentile
+
+DEFAULT_QUESTIONS = [
+    "Сколько всего видео есть в системе?",
+    "Сколько видео набрало больше 100000 просмотров за всё время?",
+    "На сколько просмотров в сумме выросли все видео 28 ноября 2025?",
+    "Сколько разных видео получали новые просмотры 27 ноября 2025?",
+]
+
+
+def load_questions(path: str) -> List[str]:
+    if not path:
+        return DEFAULT_QUESTIONS
+    lines = Path(path).read_text(encoding='utf-8').splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+async def run_mode(
+    executor: QueryExecutor,
+    questions: List[str],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    spilled = 0
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        nonlocal errors, spilled
+        async with limiter:
+            if executor.mode == QueryExecutionMode.INLINE and not executor.has_inline_capacity():
+                spilled += 1
+            started_at = time.perf_counter()
+            try:
+                await executor.run(questions[index % len(questions)])
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Query {index} failed: {e}")
+                return
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started_at
+
+    summary = {
+        'mode': executor.mode.value,
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'spilled_to_queue': spilled,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+    }
+    if latencies:
+        summary.update({
+            'median_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'max_ms': round(max(latencies), 3),
+        })
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare end-to-end query latency of the queue and inline execution modes"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=[mode.value for mode in QueryExecutionMode],
+        default=[mode.value for mode in QueryExecutionMode],
+        help="Execution modes to measure",
+    )
+    parser.add_argument("--requests", type=int, default=50, help="Queries per mode")
+    parser.add_argument("--concurrency", type=int, default=4, help="Queries in flight at once")
+    parser.add_argument("--inline-concurrency", type=int, default=4, help="Inline semaphore size")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Queued job result timeout")
+    parser.add_argument("--questions", default="", help="File with one question per line")
+    parser.add_argument("--output-dir", default="bench_results", help="Where result files are written")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    questions = load_questions(args.questions)
+
+    report = {
+        'commit': current_commit(),
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'params': vars(args),
+        'runs': [],
+    }
+
+    pool = await create_arq_pool()
+    try:
+        for mode in args.modes:
+            executor = QueryExecutor(
+                pool,
+                mode=QueryExecutionMode(mode),
+                concurrency=args.inline_concurrency,
+                result_timeout=args.timeout,
+            )
+            logger.info(f"Running {args.requests} queries in {mode} mode")
+            run = await run_mode(executor, questions, args.requests, args.concurrency)
+            logger.info(
+                f"{mode}: median {run.get('median_ms')} ms, p95 {run.get('p95_ms')} ms, "
+                f"{run['errors']} errors, {run['spilled_to_queue']} spilled"
+            )
+            report['runs'].append(run)
+    finally:
+        await pool.close()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    output_path = output_dir / f"query-latency-{report['commit']}-{timestamp}.json"
+    output_path.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+    logger.success(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
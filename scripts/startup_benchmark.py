@@ -0,0 +1,120 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+ROOT = Path(__file__).parent.parent
+LAZY_MODULES = [
+    "gigachat",
+    "dateparser",
+    "app.ml.llm",
+    "app.services.query_service",
+    "app.tasks.query_task",
+]
+BASELINE_MODULES = [
+    "fastapi",
+    "sqlalchemy.ext.asyncio",
+    "pydantic_settings",
+    "loguru",
+    "arq",
+    "redis.asyncio",
+    "prometheus_client",
+    "opentelemetry.trace",
+    "httpx",
+    "jwt",
+]
+
+
+def measure_imports(modules: List[str]) -> Tuple[Dict[str, int], int]:
+    statement = f"import {', '.join(modules)}"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Running '{statement}' failed:\n{completed.stderr}")
+
+    cumulative: Dict[str, int] = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative_us, raw_name = line.replace("import time:", "|", 1).split("|")
+        cumulative_us = cumulative_us.strip()
+        if not cumulative_us.isdigit():
+            continue
+        cumulative[raw_name.strip()] = int(cumulative_us)
+        if not raw_name.startswith("  "):
+            total_us += int(cumulative_us)
+    return cumulative, total_us
+
+
+def slowest(cumulative: Dict[str, int], top: int) -> List[Tuple[str, int]]:
+    roots = [(name, us) for name, us in cumulative.items() if "." not in name or name.startswith("app.")]
+    return sorted(roots, key=lambda item: item[1], reverse=True)[:top]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure API import time with python -X importtime and enforce a startup budget"
+    )
+    parser.add_argument("--module", default="app.main", help="Module imported by the API process")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold imports to measure")
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.3,
+        help="Maximum best-of-runs import time relative to importing the bare framework dependencies",
+    )
+    parser.add_argument("--budget-ms", type=float, default=None, help="Optional absolute limit on the median")
+    parser.add_argument("--top", type=int, default=15, help="How many slowest imports to report")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    baseline_runs = []
+    runs = []
+    for _ in range(args.runs):
+        baseline_runs.append(measure_imports(BASELINE_MODULES)[1] / 1000)
+        runs.append(measure_imports([args.module]))
+
+    baseline_ms = min(baseline_runs)
+    best_ms = min(total_us / 1000 for _, total_us in runs)
+    median_ms = statistics.median(total_us / 1000 for _, total_us in runs)
+    ratio = best_ms / baseline_ms
+
+    logger.info(f"Slowest imports of {args.module} (last run):")
+    for name, us in slowest(runs[-1][0], args.top):
+        logger.info(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [module for module in LAZY_MODULES if module in runs[-1][0]]
+    if eager:
+        logger.error(f"Modules that must be imported lazily were loaded at startup: {', '.join(eager)}")
+        failed = True
+
+    summary = (
+        f"Import time {best_ms:.1f} ms (median {median_ms:.1f} ms), "
+        f"{ratio:.2f}x the {baseline_ms:.1f} ms framework baseline"
+    )
+    if ratio > args.max_ratio:
+        logger.error(f"{summary} exceeds the {args.max_ratio:.2f}x budget")
+        failed = True
+    elif args.budget_ms is not None and median_ms > args.budget_ms:
+        logger.error(f"{summary} exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    else:
+        logger.success(f"{summary} is within the budget")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from app.services.data_loader_service import _parse_datetime_string, batched, iter_videos, transform_batch
+from generate_dataset import generate_dataset
+
+BATCH_SIZE = 100
+HOURS = 48
+PEAK_MEMORY_LIMIT = 40 * 1024 * 1024
+
+
+@pytest.fixture(scope='module')
+def datasets(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('datasets')
+    paths = {}
+    for videos in (500, 4000):
+        path = data_dir / f'videos-{videos}.json'
+        generate_dataset(path, videos=videos, creators=50, hours=HOURS)
+        paths[videos] = path
+    return paths
+
+
+def stream_peak_memory(path: Path) -> tuple:
+    _parse_datetime_string.cache_clear()
+    videos = snapshots = 0
+
+    tracemalloc.start()
+    try:
+        for raw_batch in batched(iter_videos(path, stream=True), BATCH_SIZE):
+            video_rows, snapshot_rows = transform_batch(raw_batch)
+            videos += len(video_rows)
+            snapshots += len(snapshot_rows)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return videos, snapshots, peak
+
+
+def test_streaming_peak_memory_is_bounded(datasets):
+    assert datasets[4000].stat().st_size > PEAK_MEMORY_LIMIT * 1.5
+
+    for videos, path in datasets.items():
+        loaded_videos, loaded_snapshots, peak = stream_peak_memory(path)
+        assert loaded_videos == videos
+        assert loaded_snapshots == videos * HOURS
+        assert peak < PEAK_MEMORY_LIMIT, f"{path.name}: peak {peak} bytes"
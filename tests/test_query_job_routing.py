@@ -0,0 +1,56 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.query_job_service import (
+    EXECUTE_QUEUE_NAME,
+    EXECUTE_TASK_NAME,
+    PARSE_QUEUE_NAME,
+    PARSE_TASK_NAME,
+    QueryJobService,
+    parse_job_id,
+)
+
+
+class FakePool:
+    def __init__(self):
+        self.jobs = []
+
+    async def enqueue_job(self, function, *args, _job_id, _queue_name, **kwargs):
+        self.jobs.append((function, _queue_name, _job_id, args, kwargs))
+        return SimpleNamespace(job_id=_job_id)
+
+
+class FakePlanCache:
+    def __init__(self, plans):
+        self.plans = plans
+
+    async def get(self, user_query):
+        return self.plans.get(user_query)
+
+
+def test_cached_plan_skips_parse_queue():
+    pool = FakePool()
+    plan = {'query_type': 'count', 'table': 'videos'}
+    service = QueryJobService(pool, FakePlanCache({'Сколько видео?': plan}))
+
+    job_id = asyncio.run(service.enqueue('Сколько видео?', reply_chat_id=42))
+
+    [(function, queue, enqueued_id, args, kwargs)] = pool.jobs
+    assert (function, queue, enqueued_id) == (EXECUTE_TASK_NAME, EXECUTE_QUEUE_NAME, job_id)
+    assert args == ('Сколько видео?', plan)
+    assert kwargs['reply_chat_id'] == 42
+
+
+def test_uncached_question_goes_to_parse_queue():
+    pool = FakePool()
+    service = QueryJobService(pool, FakePlanCache({}))
+
+    job_id = asyncio.run(service.enqueue('Сколько видео?'))
+
+    [(function, queue, enqueued_id, args, _)] = pool.jobs
+    assert (function, queue, enqueued_id) == (PARSE_TASK_NAME, PARSE_QUEUE_NAME, parse_job_id(job_id))
+    assert args == ('Сколько видео?',)
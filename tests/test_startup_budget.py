@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+STARTUP_ENV = {
+    "APP_NAME": "test",
+    "APP_PORT": "8000",
+}
+
+
+def test_api_startup_is_within_budget():
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / 'scripts' / 'startup_benchmark.py'), '--runs', '5'],
+        cwd=ROOT,
+        env={**STARTUP_ENV, **os.environ},
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr